@@ -52,7 +52,7 @@ def extract_ip_address_from_service_name_sync(service_name: str) -> Optional[str
     """
     try:
         result = subprocess.run(
-            cmds_map_macos["extract_ip_address_from_service_name"] + [service_name],
+            (*cmds_map_macos["extract_ip_address_from_service_name"], service_name),
             capture_output=True,
             text=True,
             check=True,
@@ -90,7 +90,8 @@ async def extract_ip_address_from_service_name(service_name: str) -> str:
         logger.info(f"Extracting IP address from macOS service name: {service_name}")
 
         proc = await asyncio.create_subprocess_exec(
-            *cmds_map_macos["extract_ip_address_from_service_name"] + [service_name],
+            *cmds_map_macos["extract_ip_address_from_service_name"],
+            service_name,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
@@ -3,11 +3,14 @@ import subprocess
 
 from scripts.powershell.rasdial_vpn_connection import RasdialL2TP_Scripts
 
+# Seconds a PowerShell script may run before it is killed and reported as failed.
+POWERSHELL_TIMEOUT = 60
+
 
 def run_powershell_script(script: str) -> str:
     """
     Executes the given PowerShell script using subprocess.run.
-    Raises RuntimeError if the script returns a non-zero exit code.
+    Raises RuntimeError if the script returns a non-zero exit code or times out.
 
     Args:
         script (str): A multiline PowerShell script to be executed.
@@ -16,14 +19,23 @@ def run_powershell_script(script: str) -> str:
         str: The standard output text from the PowerShell execution.
 
     Raises:
-        RuntimeError: If returncode != 0, indicating an error occurred.
+        RuntimeError: If returncode != 0, indicating an error occurred, or if the
+            script runs longer than POWERSHELL_TIMEOUT.
     """
     try:
-        cmd = ["powershell", "-Command", script]
+        # No user profile to load and no prompts to wait on: only the script runs.
+        cmd = ["powershell", "-NoProfile", "-NonInteractive", "-Command", script]
 
         logging.debug(f"Running PowerShell command: {cmd}")
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            timeout=POWERSHELL_TIMEOUT,
+        )
 
         if result.returncode != 0:
             raise RuntimeError(
@@ -31,6 +43,11 @@ def run_powershell_script(script: str) -> str:
             )
 
         return result.stdout or ""
+    except subprocess.TimeoutExpired as exc:
+        logging.error(f"PowerShell script timed out: {exc}")
+        raise RuntimeError(
+            f"PowerShell script timed out after {POWERSHELL_TIMEOUT} seconds."
+        ) from exc
     except Exception as exc:
         logging.error(f"Failed to run PowerShell script: {exc}")
         raise exc
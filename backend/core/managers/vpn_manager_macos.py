@@ -182,7 +182,7 @@ class MacOSL2TPConnector(IVpnConnector):
         :return: "Connected", "Disconnected", or "Unknown status".
         """
         try:
-            cmd = cmds_map_macos["check_connection_status"] + [self.service_name]
+            cmd = (*cmds_map_macos["check_connection_status"], self.service_name)
             stdout, _ = await run_macos_command(cmd, timeout=5)
             lower_out = stdout.lower()
             if "disconnected" in lower_out:
@@ -227,11 +227,12 @@ class MacOSL2TPConnector(IVpnConnector):
             self._check_sudo_password_stored()
 
             await open_macos_network_settings()
-            cmd = cmds_map_macos["connect_to_l2tp_service"] + [
+            cmd = (
+                *cmds_map_macos["connect_to_l2tp_service"],
                 self.service_name,
                 "--secret",
                 self.service_psk_value,
-            ]
+            )
             _, _ = await run_macos_command(cmd, timeout=10)
 
             self.current_vpn_ip = await extract_ip_address_from_service_name(
@@ -259,11 +260,12 @@ class MacOSL2TPConnector(IVpnConnector):
         """
         try:
             await open_macos_network_settings()
-            cmd = cmds_map_macos["connect_to_l2tp_service"] + [
+            cmd = (
+                *cmds_map_macos["connect_to_l2tp_service"],
                 self.service_name,
                 "--secret",
                 self.service_psk_value,
-            ]
+            )
             _, _ = await run_macos_command(cmd, timeout=10)
 
             self.current_vpn_ip = await extract_ip_address_from_service_name(
@@ -326,7 +328,7 @@ class MacOSL2TPConnector(IVpnConnector):
             return "No active VPN connection to disconnect from."
 
         try:
-            cmd = cmds_map_macos["disconnect_from_l2tp_service"] + [self.service_name]
+            cmd = (*cmds_map_macos["disconnect_from_l2tp_service"], self.service_name)
             _, _ = await run_macos_command(cmd, timeout=10)
             result = f"Disconnected VPN '{self.service_name}' from {self.current_vpn_ip} successfully!"
             logger.info(result)
@@ -36,10 +36,17 @@ if desired. However, this combined approach is sufficient for typical usage scen
 """
 
 import asyncio
+import ctypes
+import ipaddress
 import logging
+import os
 import socket
 import subprocess
-from typing import Optional
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import wintypes
+from typing import Dict, Optional, Tuple
 
 from configuration.win_l2tp_connection import create_windows_l2tp
 from core.interfaces.ivpn_connector import IVpnConnector
@@ -47,6 +54,55 @@ from utils.reusable.commands.windows.reusable_commands_map import cmds_map_windo
 
 logger = logging.getLogger(__name__)
 
+# Keeps rasdial/netsh from flashing a console window when the backend runs without one.
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _is_ip(value: str) -> bool:
+    """
+    Checks whether the given string is already an IP address literal (no DNS needed).
+    """
+    try:
+        ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
+class _GUID(ctypes.Structure):
+    _fields_ = [
+        ("Data1", wintypes.DWORD),
+        ("Data2", wintypes.WORD),
+        ("Data3", wintypes.WORD),
+        ("Data4", wintypes.BYTE * 8),
+    ]
+
+
+class _LUID(ctypes.Structure):
+    _fields_ = [("LowPart", wintypes.DWORD), ("HighPart", wintypes.LONG)]
+
+
+class _RASCONNW(ctypes.Structure):
+    """
+    RASCONNW from ras.h (Windows 7 and later layout), as filled by RasEnumConnectionsW.
+    ras.h declares it with 4-byte packing.
+    """
+
+    _pack_ = 4
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("hrasconn", wintypes.HANDLE),
+        ("szEntryName", wintypes.WCHAR * 257),
+        ("szDeviceType", wintypes.WCHAR * 17),
+        ("szDeviceName", wintypes.WCHAR * 129),
+        ("szPhonebook", wintypes.WCHAR * 260),
+        ("dwSubEntry", wintypes.DWORD),
+        ("guidEntry", _GUID),
+        ("dwFlags", wintypes.DWORD),
+        ("luid", _LUID),
+        ("guidCorrelationId", _GUID),
+    ]
+
 
 class WindowsL2TPConnector(IVpnConnector):
     """
@@ -65,28 +121,156 @@ class WindowsL2TPConnector(IVpnConnector):
     - disable_kill_switch ? (haven't tested yet)
     """
 
+    # Backoff (in seconds) between rasdial retries on "Remote Access error 756".
+    # One delay per retry, each well under the 5s ceiling: at most four tries in total
+    # (the first dial plus three retries).
+    ERROR_756_RETRY_DELAYS = (0.25, 0.5, 1.0)
+
+    # While known-disconnected, a status check younger than this (in seconds) is reused
+    # instead of spawning another rasdial process.
+    STATUS_CACHE_TTL = 2.0
+
+    # RasConnectionNotificationW flags, and the Win32 wait constants used by the
+    # watcher thread.
+    RASCN_CONNECTION = 0x00000001
+    RASCN_DISCONNECTION = 0x00000002
+    WAIT_OBJECT_0 = 0x00000000
+    INFINITE = 0xFFFFFFFF
+    # Returned by RasEnumConnectionsW when the buffer can't hold every connection.
+    ERROR_BUFFER_TOO_SMALL = 603
+
+    # Without RAS notifications, a connected connector refreshes its status in the
+    # background at this interval (in seconds) instead of on every status() call.
+    STATUS_REFRESH_INTERVAL = 3.0
+
+    # A resolved hostname is reused for this long (in seconds), then looked up again,
+    # so a VPN Gate server that moves to another IP is picked up on a later connect.
+    DNS_CACHE_TTL = 60.0
+
+    # Upper bounds (in seconds) for each kind of spawned command; a hung rasdial/netsh
+    # is killed instead of stalling the caller forever.
+    CMD_TIMEOUTS = {"connect": 30.0, "disconnect": 15.0, "status": 5.0, "netsh": 10.0}
+
+    # netsh commands that remove both kill switch rules (see _run_netsh_script).
+    KILL_SWITCH_DELETE_RULES = (
+        "advfirewall firewall delete rule name=KillSwitchBlockAll",
+        "advfirewall firewall delete rule name=KillSwitchAllowVPN",
+    )
+
+    # Immutable copies of the command templates, built once at import time.
+    _argv_templates = {name: tuple(argv) for name, argv in cmds_map_windows.items()}
+
     def __init__(self, connection_name: str = "MyL2TP"):
         self.connection_name = connection_name
         self.is_connected: Optional[bool] = False
         self.established_server_ip: Optional[str] = False
+        # Serializes rasdial/netsh mutations so concurrent API calls can't race each other.
+        self._mutation_lock = asyncio.Lock()
+        self._ks_state: bool = False
+        # The server IP the KillSwitchAllowVPN rule lets through while _ks_state is set.
+        self._ks_ip: Optional[str] = None
+        # hostname -> (resolved at, IPv4 address), filled by _resolve_hostname_async.
+        self._resolved_hosts: Dict[str, Tuple[float, str]] = {}
+        self._last_status_ts: float = 0.0
+        # Win32 event signalled by RAS on connect/disconnect, and the event that
+        # releases the watcher thread's wait (both None until subscribed).
+        self._conn_event: Optional[int] = None
+        self._conn_stop_event: Optional[int] = None
+        self._conn_watch_task: Optional[asyncio.Task] = None
+        self._status_task: Optional[asyncio.Task] = None
+
+    def _build_argv(self, kind: str, *extra: str) -> Tuple[str, ...]:
+        """
+        Builds the argv for one of the cmds_map_windows commands.
+
+        Args:
+            kind (str): The key of the command template in cmds_map_windows.
+            *extra (str): Arguments appended after the template.
+
+        Returns:
+            Tuple[str, ...]: The full argv, ready for subprocess.
+        """
+        return (*self._argv_templates[kind], *extra)
+
+    def _cached_host(self, hostname: str) -> Optional[str]:
+        """
+        Returns the cached IP of a hostname, or None if it was never resolved or
+        the entry is older than DNS_CACHE_TTL.
+        """
+        entry = self._resolved_hosts.get(hostname)
+        if entry is None or time.monotonic() - entry[0] >= self.DNS_CACHE_TTL:
+            return None
+        return entry[1]
 
-    def _resolve_hostname(self, hostname: str) -> str:
+    async def _resolve_hostname_async(self, hostname: str) -> str:
         """
-        Resolve the hostname to an IP address.
+        Resolve the hostname to an IP address without blocking the event loop.
+        IP literals are returned as-is, and a hostname resolved before is answered
+        from the connector's cache (for DNS_CACHE_TTL seconds), so no DNS lookup
+        happens for either.
 
         Args:
-            hostname (str): The hostname to resolve.
+            hostname (str): The hostname (or IP) to resolve.
 
         Returns:
             str: The resolved IP address.
         """
-        try:
-            return socket.gethostbyname(hostname)
-        except Exception as exc:
-            logger.error(f"Failed to resolve hostname {hostname}: {exc}")
-            raise exc
+        if _is_ip(hostname):
+            return hostname
+
+        ip = self._cached_host(hostname)
+        if ip is None:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(
+                    hostname, None, family=socket.AF_INET
+                )
+            except Exception as exc:
+                logger.error(f"Failed to resolve hostname {hostname}: {exc}")
+                raise exc
+            ip = infos[0][4][0]
+            self._resolved_hosts[hostname] = (time.monotonic(), ip)
+        return ip
+
+    async def _run_command(
+        self,
+        argv: Tuple[str, ...],
+        capture: bool = True,
+        timeout: Optional[float] = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Runs a command as a native asyncio subprocess, so no worker thread is held
+        while it executes.
+
+        Args:
+            argv (Tuple[str, ...]): The command to run.
+            capture (bool): Whether stdout/stderr should be captured. When False the
+                output is discarded.
+            timeout (Optional[float]): Seconds to wait before the process is killed.
 
-    def _reset_connection(self) -> None:
+        Returns:
+            subprocess.CompletedProcess: The finished process. Captured output is kept as
+            raw bytes and only decoded when it has to be reported.
+
+        Raises:
+            RuntimeError: If the command didn't finish within the timeout.
+        """
+        stream = asyncio.subprocess.PIPE if capture else asyncio.subprocess.DEVNULL
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=stream,
+            stderr=stream,
+            creationflags=_NO_WINDOW,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise RuntimeError(f"{argv[0]} timed out after {timeout} seconds")
+        return subprocess.CompletedProcess(argv, proc.returncode, stdout, stderr)
+
+    async def _reset_connection(self) -> None:
         """
         Resets (disconnects) an existing VPN connection using the profile name.
 
@@ -100,99 +284,35 @@ class WindowsL2TPConnector(IVpnConnector):
         Returns:
             None
         """
-        """Сбрасывает (отключает) существующее VPN-соединение по имени профиля."""
         try:
-            disconnect_cmd = cmds_map_windows["disconnect_from_l2tp_service"][:]
-            disconnect_cmd += [self.connection_name, "/disconnect"]
+            disconnect_cmd = self._build_argv(
+                "disconnect_from_l2tp_service", self.connection_name, "/disconnect"
+            )
             logger.info(f"Resetting connection with command: {disconnect_cmd}")
-            subprocess.run(disconnect_cmd, capture_output=True, text=True)
+            await self._run_command(
+                disconnect_cmd, capture=False, timeout=self.CMD_TIMEOUTS["disconnect"]
+            )
         except Exception as exc:
             logger.error(f"Failed to reset connection: {exc}")
             raise exc
 
-    def _connect_sync(
-        self,
-        server_ip: Optional[str],
-        username: str,
-        password: str,
-        psk: str,
-        kill_switch_enabled: bool = False,
-    ) -> str:
+    async def _dial(self, username: str, password: str) -> subprocess.CompletedProcess:
         """
-        Establishes a synchronous VPN connection using L2TP protocol on a Windows system.
-        This method attempts to connect to a VPN server using the provided credentials and pre-shared key (PSK).
-        If no server IP is provided, it uses the previously established server connection details.
-        It also supports enabling a kill switch to block internet traffic if the VPN connection drops.
+        Runs a single rasdial attempt for the configured connection profile.
+
         Args:
-            server_ip (Optional[str]): The IP address of the VPN server. If None, the method uses the established server IP.
             username (str): The username for VPN authentication.
             password (str): The password for VPN authentication.
-            psk (str): The pre-shared key (PSK) for the L2TP VPN connection.
-            kill_switch_enabled (bool, optional): Whether to enable the kill switch. Defaults to False.
+
         Returns:
-            str: A success message indicating the VPN connection was established.
-        Raises:
-            RuntimeError: If the VPN connection fails after retrying.
-            Exception: For any other unexpected errors during the connection process.
-        Notes:
-            - If the connection fails with "Remote Access error 756", the method resets the connection and retries once.
-            - The method logs detailed information about the connection process, including the commands executed.
-            - The kill switch, if enabled, is configured before attempting the connection.
-        Logging:
-            - Logs an info message if no server IP is provided and the established connection details are used.
-            - Logs the command used to attempt the connection.
-            - Logs a warning if "Remote Access error 756" is encountered and a retry is initiated.
-            - Logs an error message if the connection fails.
-        Dependencies:
-            - The `create_windows_l2tp` function is used to configure the L2TP VPN connection.
-            - The `subprocess.run` method is used to execute the connection command.
-            - The `time.sleep` function is used to introduce a delay before retrying the connection.
+            subprocess.CompletedProcess: The finished rasdial process.
         """
-        try:
-            if not server_ip:
-                server_ip = self.established_server_ip
-                logger.info(
-                    "No server_ip provided; using established connection details."
-                )
-            else:
-                create_windows_l2tp(
-                    server_ip=server_ip,
-                    name=self.connection_name,
-                    psk=psk,
-                )
-
-            cmd = cmds_map_windows["connect_to_l2tp_service"][:]
-            cmd += [self.connection_name, username, password]
+        cmd = self._build_argv(
+            "connect_to_l2tp_service", self.connection_name, username, password
+        )
 
-            if kill_switch_enabled:
-                self.enable_kill_switch(server_ip)
-
-            logger.info(f"Attempting connection with command: {cmd}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                error_msg = result.stdout or result.stderr
-                if "Remote Access error 756" in error_msg:
-                    logger.warning(
-                        "Error 756 detected. Resetting connection and retrying."
-                    )
-                    self._reset_connection()
-
-                    import time
-
-                    time.sleep(1)
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    raise RuntimeError(
-                        f"rasdial failed: {result.stdout or result.stderr}"
-                    )
-
-            return f"Connected to {server_ip or self.connection_name} successfully."
-        except Exception as exc:
-            logger.error(
-                f"Failed to connect to {server_ip or self.connection_name}: {exc}"
-            )
-            raise exc
+        logger.info(f"Attempting connection with command: {cmd}")
+        return await self._run_command(cmd, timeout=self.CMD_TIMEOUTS["connect"])
 
     async def connect(
         self,
@@ -202,33 +322,86 @@ class WindowsL2TPConnector(IVpnConnector):
         psk: Optional[str] = "vpn",
         kill_switch_enabled: bool = False,
     ) -> str:
+        resolved_ip: Optional[str] = None
         try:
             """
-            VPN Class method to connect to a VPN server using L2TP/IPsec protocol on Windows. It uses asyncio-thread as a final stage to make this method call in async style.
+            VPN Class method to connect to a VPN server using L2TP/IPsec protocol on Windows.
+            rasdial runs as a native asyncio subprocess; only the PowerShell profile setup
+            (create_windows_l2tp) still goes through a worker thread.
+
+            If no server IP is provided, the previously established connection profile is
+            dialled again.
+
+            If rasdial fails with "Remote Access error 756", the connection is reset and retried
+            with a bounded exponential backoff (see ERROR_756_RETRY_DELAYS).
+
+            The server hostname is resolved once here and the resulting IP is reused for the
+            profile, the kill switch and the established connection details.
 
             Raises:
                 RuntimeError: If the connection fails.
             """
-            if kill_switch_enabled:
-                self.enable_kill_switch(server_ip)
-
-            return await asyncio.to_thread(
-                self._connect_sync,
-                server_ip,
-                username,
-                password,
-                psk,
-                kill_switch_enabled,
-            )
+            if server_ip:
+                resolved_ip = await self._resolve_hostname_async(server_ip)
+
+            async with self._mutation_lock:
+                if self.is_connected and resolved_ip == self.established_server_ip:
+                    return f"Already connected to {server_ip or self.connection_name}."
+
+                if resolved_ip:
+                    await asyncio.to_thread(
+                        create_windows_l2tp,
+                        server_ip=resolved_ip,
+                        name=self.connection_name,
+                        psk=psk,
+                    )
+                else:
+                    logger.info(
+                        "No server_ip provided; using established connection details."
+                    )
+
+                result = await self._dial(username, password)
+
+                for delay in self.ERROR_756_RETRY_DELAYS:
+                    if result.returncode == 0 or b"Remote Access error 756" not in (
+                        result.stdout or result.stderr
+                    ):
+                        break
+                    logger.warning(
+                        f"Error 756 detected. Resetting connection and retrying in {delay}s."
+                    )
+                    await self._reset_connection()
+                    await asyncio.sleep(delay)
+                    result = await self._dial(username, password)
+
+                if result.returncode != 0:
+                    raise RuntimeError(
+                        "rasdial failed: "
+                        + (result.stdout or result.stderr).decode("utf-8", "replace")
+                    )
+
+                self.is_connected = True
+                self.established_server_ip = resolved_ip or self.established_server_ip
+                logger.info(f"Connected to {self.connection_name}.")
+
+                if not self._start_connection_watch() and (
+                    self._status_task is None or self._status_task.done()
+                ):
+                    self._status_task = asyncio.create_task(self._status_refresher())
+
+                # The kill switch is only armed once rasdial has succeeded, so it can
+                # never block the VPN handshake itself.
+                if kill_switch_enabled:
+                    await self._apply_kill_switch(
+                        resolved_ip or self.established_server_ip
+                    )
+
+                return f"Connected to {server_ip or self.connection_name} successfully."
         except Exception as exc:
             logger.error(f"Failed to connect to {server_ip}: {exc}")
             raise exc
-        finally:
-            self.is_connected = True
-            self.established_server_ip = server_ip
-            print("Connected status", self.is_connected)
 
-    def _disconnect_sync(
+    async def disconnect(
         self,
         server_ip: Optional[str] = None,
         username: Optional[str] = None,
@@ -236,60 +409,344 @@ class WindowsL2TPConnector(IVpnConnector):
         psk: Optional[str] = None,
     ) -> str:
         """
-        Class method to disconnect from a VPN server on Windows. This is syncr-wrapper that uses subproccess lib in order to execute commands in powershell.
+        Class method to disconnect from a VPN server on Windows. rasdial /disconnect runs
+        as a native asyncio subprocess.
+
+        Disconnecting while not connected doesn't spawn rasdial, so defensive calls stay
+        cheap. The kill switch rules, if they were added, are removed either way: a
+        tunnel that dropped on its own leaves them in place. The background status
+        tasks are always stopped.
 
         Raises:
             RuntimeError: If the disconnection fails.
         """
-        try:
-            if not self.is_connected:
-                raise ValueError("VPN Connection hasn't been established yet!")
+        async with self._mutation_lock:
+            try:
+                # Checked under the lock, like connect()'s idempotency check, so a
+                # disconnect racing an in-flight connect() waits for it to finish.
+                if self.is_connected:
+                    cmd = self._build_argv(
+                        "disconnect_from_l2tp_service",
+                        self.connection_name,
+                        "/disconnect",
+                    )
 
-            # TODO: extract to a separate method/function
-            cmd = cmds_map_windows["disconnect_from_l2tp_service"][:]
-            cmd += [self.connection_name, "/disconnect"]
+                    logger.info(
+                        f"WindowsL2TPConnector: disconnecting from {server_ip} with cmd: {cmd}"
+                    )
 
-            logger.info(
-                f"WindowsL2TPConnector: disconnecting from {server_ip} with cmd: {cmd}"
-            )
+                    result = await self._run_command(
+                        cmd, timeout=self.CMD_TIMEOUTS["disconnect"]
+                    )
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+                    if result.returncode != 0:
+                        raise RuntimeError(
+                            "rasdial /disconnect failed: "
+                            + (result.stdout or result.stderr).decode(
+                                "utf-8", "replace"
+                            )
+                        )
+                    message = f"Disconnected from {server_ip} successfully."
+                else:
+                    message = "Already disconnected."
+
+                if self._ks_state:
+                    await self._remove_kill_switch()
+                return message
+            except Exception as exc:
+                logger.error(f"Failed to disconnect from {server_ip}: {exc}")
+                raise exc
+            finally:
+                self.is_connected = False
+                if self._status_task is not None:
+                    self._status_task.cancel()
+                    self._status_task = None
+                await self._stop_connection_watch()
+
+    async def _status_check(self, server_ip: Optional[str] = None) -> str:
+        """
+        Runs rasdial once to check the status of the VPN connection on Windows.
 
-            if result.returncode != 0:
-                raise RuntimeError(
-                    f"rasdial /disconnect failed: {result.stdout or result.stderr}"
-                )
+        The output is read line by line as raw bytes and reading stops at the
+        "command completed successfully" line, so the output is never buffered or
+        decoded as a whole.
 
-            return f"Disconnected from {server_ip} successfully."
+        Returns:
+            str: The status of the VPN connection.
+        """
+        try:
+            cmd = self._build_argv("check_connection_status", self.connection_name)
+
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                creationflags=_NO_WINDOW,
+            )
 
+            name = self.connection_name.lower().encode()
+
+            async def read_verdict() -> bool:
+                seen_name = False
+                async for line in proc.stdout:
+                    line = line.lower()
+                    if name in line:
+                        seen_name = True
+                    if b"command completed successfully" in line:
+                        return seen_name
+                return False
+
+            timeout = self.CMD_TIMEOUTS["status"]
+            try:
+                connected = await asyncio.wait_for(read_verdict(), timeout)
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"rasdial timed out after {timeout} seconds")
+            finally:
+                if proc.returncode is None:
+                    try:
+                        proc.kill()
+                    except ProcessLookupError:
+                        pass
+                await proc.wait()
+
+            return self._format_status(connected)
         except Exception as exc:
-            logger.error(f"Failed to disconnect from {server_ip}: {exc}")
+            logger.error(f"Failed to get status for {server_ip}: {exc}")
             raise exc
 
-    async def disconnect(
-        self,
-        server_ip: Optional[str] = None,
-        username: Optional[str] = None,
-        password: Optional[str] = None,
-        psk: Optional[str] = None,
-    ) -> str:
+    def _subscribe_connection_events(self) -> bool:
         """
-        Class method to disconnect from a VPN server on Windows. It uses asyncio-thread as a final stage to make this method call in async style.
+        Registers a Win32 event that RAS signals whenever any connection is established
+        or torn down (RasConnectionNotificationW with INVALID_HANDLE_VALUE).
 
-        Raises:
-            RuntimeError: If the disconnection fails.
+        Returns:
+            bool: True if the subscription is active, False if it isn't available
+            (non-Windows host, missing rasapi32, or the call failed).
         """
+        if self._conn_event is not None:
+            return True
+
+        windll = getattr(ctypes, "windll", None)
+        if windll is None:
+            return False
+
         try:
-            return await asyncio.to_thread(
-                self._disconnect_sync, server_ip, username, password, psk
+            kernel32 = windll.kernel32
+            kernel32.CreateEventW.restype = wintypes.HANDLE
+            kernel32.CreateEventW.argtypes = (
+                wintypes.LPVOID,
+                wintypes.BOOL,
+                wintypes.BOOL,
+                wintypes.LPCWSTR,
             )
-        except Exception as exc:
-            logger.error(f"Failed to disconnect from {server_ip}: {exc}")
-            raise exc
+            rasapi32 = windll.rasapi32
+            rasapi32.RasConnectionNotificationW.argtypes = (
+                wintypes.HANDLE,
+                wintypes.HANDLE,
+                wintypes.DWORD,
+            )
+
+            # Auto-reset event: every wake-up corresponds to a fresh state change.
+            event = kernel32.CreateEventW(None, False, False, None)
+            if not event:
+                return False
+            # Manual-reset: once set, it keeps the watcher thread from waiting again.
+            stop_event = kernel32.CreateEventW(None, True, False, None)
+            if not stop_event:
+                kernel32.CloseHandle(wintypes.HANDLE(event))
+                return False
+
+            rc = rasapi32.RasConnectionNotificationW(
+                wintypes.HANDLE(-1),
+                event,
+                self.RASCN_CONNECTION | self.RASCN_DISCONNECTION,
+            )
+            if rc != 0:
+                kernel32.CloseHandle(wintypes.HANDLE(event))
+                kernel32.CloseHandle(wintypes.HANDLE(stop_event))
+                logger.warning(f"RasConnectionNotificationW failed with code {rc}")
+                return False
+        except (AttributeError, OSError) as exc:
+            logger.warning(f"RAS connection notifications are unavailable: {exc}")
+            return False
+
+        self._conn_event = event
+        self._conn_stop_event = stop_event
+        return True
+
+    def _start_connection_watch(self) -> bool:
+        """
+        Subscribes to RAS connect/disconnect notifications and starts the task that
+        watches them, unless it is already running.
+
+        Returns:
+            bool: True if the watcher is running, False if notifications aren't
+            available (see _subscribe_connection_events).
+        """
+        if self._conn_watch_task is not None and not self._conn_watch_task.done():
+            return True
+        if not self._subscribe_connection_events():
+            return False
+        self._conn_watch_task = asyncio.create_task(self._watch_connection_events())
+        return True
+
+    async def _stop_connection_watch(self) -> None:
+        """
+        Cancels the RAS watcher task, waits for it to release its thread, and closes
+        the event handles. A no-op if the connector never subscribed.
+        """
+        task, self._conn_watch_task = self._conn_watch_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as exc:
+                logger.error(f"RAS connection watcher failed: {exc}")
+        self._close_connection_events()
+
+    def _close_connection_events(self) -> None:
+        """
+        Closes the RAS notification event and the watcher's stop event. Closing the
+        notification event also ends the RAS registration.
+        """
+        handles = (self._conn_event, self._conn_stop_event)
+        self._conn_event = self._conn_stop_event = None
+        for handle in handles:
+            if handle is not None:
+                ctypes.windll.kernel32.CloseHandle(wintypes.HANDLE(handle))
+
+    def _ras_connection_active(self) -> bool:
+        """
+        Checks with RasEnumConnectionsW whether this connector's RAS entry is among
+        the active connections. Blocking, but spawns no process; the watcher runs it
+        on its own thread.
+
+        Returns:
+            bool: True if the connection named self.connection_name is active.
+
+        Raises:
+            OSError: If RasEnumConnectionsW fails.
+        """
+        rasapi32 = ctypes.windll.rasapi32
+        rasapi32.RasEnumConnectionsW.argtypes = (
+            ctypes.POINTER(_RASCONNW),
+            wintypes.LPDWORD,
+            wintypes.LPDWORD,
+        )
+        conns = (_RASCONNW * 1)()
+        while True:
+            conns[0].dwSize = ctypes.sizeof(_RASCONNW)
+            size = wintypes.DWORD(ctypes.sizeof(conns))
+            count = wintypes.DWORD(0)
+            rc = rasapi32.RasEnumConnectionsW(
+                conns, ctypes.byref(size), ctypes.byref(count)
+            )
+            if rc != self.ERROR_BUFFER_TOO_SMALL:
+                break
+            # One spare entry for a connection added between the two calls.
+            conns = (_RASCONNW * (size.value // ctypes.sizeof(_RASCONNW) + 1))()
+
+        if rc != 0:
+            raise OSError(f"RasEnumConnectionsW failed with code {rc}")
+
+        name = self.connection_name.lower()
+        return any(conns[i].szEntryName.lower() == name for i in range(count.value))
+
+    async def _refresh_connection_state(self) -> None:
+        """
+        Runs a single rasdial check and stores the outcome in self.is_connected.
+        Used by the background refresher when RAS notifications aren't available.
+        """
+        result = await self._status_check()
+        self.is_connected = result != "Disconnected"
+        self._last_status_ts = time.monotonic()
+
+    def _format_status(self, connected: bool) -> str:
+        """
+        Builds the status message reported by status().
+
+        Args:
+            connected (bool): Whether the connection is up.
+
+        Returns:
+            str: The status of the VPN connection.
+        """
+        if connected:
+            return f"Connected to {self.connection_name} successfully. Connection IP: {self.established_server_ip}"
+        return "Disconnected"
+
+    async def _status_refresher(self) -> None:
+        """
+        Background task started by connect() when RAS notifications aren't available.
+        Re-checks the connection every STATUS_REFRESH_INTERVAL seconds and stops once
+        the connection is gone (or when disconnect() cancels it).
+        """
+        while self.is_connected:
+            await asyncio.sleep(self.STATUS_REFRESH_INTERVAL)
+            try:
+                await self._refresh_connection_state()
+            except Exception as exc:
+                logger.error(f"Failed to refresh connection state: {exc}")
+
+    async def _watch_connection_events(self) -> None:
+        """
+        Background task started by _start_connection_watch(): each time RAS signals a
+        connect or disconnect, re-enumerates the RAS connections (see
+        _ras_connection_active) and stores the outcome in self.is_connected. It stops
+        once the connection is gone, or when disconnect() cancels it.
+
+        The blocking wait and the enumeration run on a thread owned by this task
+        rather than on the shared default executor. The wait covers the RAS event and
+        the stop event together with no timeout, so the thread sleeps until one of
+        them is set. On exit the stop event is set, the thread is joined and the
+        event handles are closed.
+        """
+        kernel32 = ctypes.windll.kernel32
+        kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        kernel32.WaitForMultipleObjects.argtypes = (
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.HANDLE),
+            wintypes.BOOL,
+            wintypes.DWORD,
+        )
+        handles = (wintypes.HANDLE * 2)(self._conn_event, self._conn_stop_event)
+        stop_event = wintypes.HANDLE(self._conn_stop_event)
+        loop = asyncio.get_running_loop()
+        waiter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ras-watch")
+
+        try:
+            while True:
+                rc = await loop.run_in_executor(
+                    waiter,
+                    kernel32.WaitForMultipleObjects,
+                    2,
+                    handles,
+                    False,
+                    self.INFINITE,
+                )
+                if rc != self.WAIT_OBJECT_0:
+                    # The stop event, or a failed wait.
+                    break
+                try:
+                    self.is_connected = await loop.run_in_executor(
+                        waiter, self._ras_connection_active
+                    )
+                    self._last_status_ts = time.monotonic()
+                except Exception as exc:
+                    logger.error(f"Failed to refresh connection state: {exc}")
+                    continue
+                if not self.is_connected:
+                    logger.info(f"{self.connection_name} dropped; RAS watcher stops.")
+                    break
         finally:
-            self.is_connected = False
+            kernel32.SetEvent(stop_event)
+            waiter.shutdown(wait=True)
+            self._close_connection_events()
 
-    def _status_check_sync(
+    async def status(
         self,
         server_ip: Optional[str] = None,
         username: Optional[str] = None,
@@ -297,32 +754,150 @@ class WindowsL2TPConnector(IVpnConnector):
         psk: Optional[str] = None,
     ) -> str:
         """
-        Class method to check the status of a VPN connection on Windows. This is syncr-wrapper that uses subproccess lib in order to execute commands in powershell.
+        Class method to check the status of a VPN connection on Windows.
+
+        While connected, the status is read from self.is_connected without spawning
+        rasdial: connect() starts the RAS connect/disconnect watcher, or, where RAS
+        notifications aren't available, a background refresher (see
+        STATUS_REFRESH_INTERVAL), and either keeps it current.
+        Otherwise rasdial is polled; while the connector knows it is disconnected, a
+        check made less than STATUS_CACHE_TTL seconds ago is reused.
 
         Returns:
             str: The status of the VPN connection.
         """
         try:
-            # TODO: extract to a separate method/function
-            cmd = cmds_map_windows["check_connection_status"][:]
-            cmd += [self.connection_name]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            output = result.stdout.lower()
+            if any(
+                task is not None and not task.done()
+                for task in (self._conn_watch_task, self._status_task)
+            ):
+                return self._format_status(self.is_connected)
 
             if (
-                self.connection_name.lower() in output
-                and "command completed successfully" in output
+                not self.is_connected
+                and time.monotonic() - self._last_status_ts < self.STATUS_CACHE_TTL
             ):
-                return f"Connected to {self.connection_name} successfully. Connection IP: {self.established_server_ip}"
-            else:
-                return f"Disconnected"
+                return "Disconnected"
+
+            result = await self._status_check(server_ip)
+            self._last_status_ts = time.monotonic()
+            return result
         except Exception as exc:
             logger.error(f"Failed to get status for {server_ip}: {exc}")
             raise exc
 
-    async def status(
+    async def _run_netsh_script(
+        self, lines: Tuple[str, ...], capture: bool = True
+    ) -> subprocess.CompletedProcess:
+        """
+        Applies several netsh commands with a single `netsh -f <script>` process
+        instead of spawning netsh once per command.
+
+        Args:
+            lines (Tuple[str, ...]): netsh commands, without the leading "netsh".
+            capture (bool): Whether the output of netsh should be captured.
+
+        Returns:
+            subprocess.CompletedProcess: The finished netsh process.
+        """
+        # delete=False: on Windows netsh can't open a file another handle still holds.
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".netsh", delete=False, encoding="utf-8"
+        ) as script:
+            script.write("\n".join((*lines, "exit")) + "\n")
+        try:
+            return await self._run_command(
+                ("netsh", "-f", script.name), capture, self.CMD_TIMEOUTS["netsh"]
+            )
+        finally:
+            os.unlink(script.name)
+
+    async def _apply_kill_switch(self, server_ip: Optional[str] = None) -> str:
+        """
+        A naive kill-switch via netsh advfirewall.
+        Blocks all outbound traffic except the VPN server IP. Any existing kill switch
+        rules are removed first so they never pile up, then both rules are added by one
+        netsh process; if that fails, whatever part of it was applied is removed again.
+        A kill switch already enabled for the same IP is left as it is; one enabled for
+        another IP is replaced.
+
+        Args:
+            server_ip (str): The already-resolved VPN server IP (no DNS lookup is done here).
+        Returns:
+            str: Success message.
+        """
+        try:
+            if self._ks_state and server_ip == self._ks_ip:
+                return "Kill switch already enabled."
+
+            if not server_ip:
+                raise ValueError("server_ip cannot be None or empty.")
+
+            ip_firewall = server_ip
+
+            logger.info(f"Enabling kill switch on Windows for {ip_firewall}...")
+
+            # Rules left behind by an earlier process (whose _ks_state is lost) would
+            # otherwise be duplicated; deleting a missing rule is harmless.
+            await self._run_netsh_script(self.KILL_SWITCH_DELETE_RULES, False)
+
+            result = await self._run_netsh_script(
+                (
+                    "advfirewall firewall add rule name=KillSwitchBlockAll"
+                    " dir=out action=block remoteip=any",
+                    "advfirewall firewall add rule name=KillSwitchAllowVPN"
+                    f" dir=out action=allow remoteip={ip_firewall}",
+                )
+            )
+            if result.returncode != 0:
+                await self._run_netsh_script(self.KILL_SWITCH_DELETE_RULES, False)
+                self._ks_state = False
+                self._ks_ip = None
+                raise RuntimeError(
+                    f"Failed to apply kill switch rules for {ip_firewall}: "
+                    + (result.stdout or result.stderr).decode("utf-8", "replace")
+                )
+
+            self._ks_state = True
+            self._ks_ip = ip_firewall
+            return "Kill switch enabled successfully."
+
+        except Exception as exc:
+            logger.error(f"Failed to enable kill switch: {exc}")
+            raise exc
+
+    async def _remove_kill_switch(self) -> str:
+        """
+        Remove kill-switch rules with a single netsh process. The kill switch is only
+        marked as disabled once netsh reports success.
+
+        Returns:
+            str: Success message.
+
+        Raises:
+            RuntimeError: If netsh failed to remove the rules.
+        """
+        try:
+            if not self._ks_state:
+                return "Kill switch already disabled."
+
+            logger.info("Disabling kill switch on Windows.")
+
+            result = await self._run_netsh_script(self.KILL_SWITCH_DELETE_RULES)
+            if result.returncode != 0:
+                raise RuntimeError(
+                    "Failed to remove kill switch rules: "
+                    + (result.stdout or result.stderr).decode("utf-8", "replace")
+                )
+
+            self._ks_state = False
+            self._ks_ip = None
+            return "Kill switch disabled successfully."
+        except Exception as exc:
+            logger.error(f"Failed to disable kill switch: {exc}")
+            raise exc
+
+    async def enable_kill_switch(
         self,
         server_ip: Optional[str] = None,
         username: Optional[str] = None,
@@ -330,161 +905,32 @@ class WindowsL2TPConnector(IVpnConnector):
         psk: Optional[str] = None,
     ) -> str:
         """
-        Class method to check the status of a VPN connection on Windows. It uses asyncio-thread as a final stage to make this method call in async style.
+        Enables the netsh-based kill switch asynchronously. Falls back to the established
+        server IP when none is given.
 
         Returns:
-            str: The status of the VPN connection.
+            str: Success message.
         """
-        try:
-            return await asyncio.to_thread(
-                self._status_check_sync, server_ip, username, password, psk
-            )
-        except Exception as exc:
-            logger.error(f"Failed to get status for {server_ip}: {exc}")
-            raise exc
+        ip_firewall = (
+            await self._resolve_hostname_async(server_ip)
+            if server_ip
+            else self.established_server_ip
+        )
+        async with self._mutation_lock:
+            return await self._apply_kill_switch(ip_firewall)
+
+    async def disable_kill_switch(
+        self,
+        server_ip: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        psk: Optional[str] = None,
+    ) -> str:
+        """
+        Disables the netsh-based kill switch asynchronously.
 
-    # def enable_kill_switch(
-    #     self,
-    #     server_ip: Optional[str] = None,
-    #     username: Optional[str] = None,
-    #     password: Optional[str] = None,
-    #     psk: Optional[str] = None,
-    # ) -> str:
-    #     """
-    #     A naive kill-switch via netsh advfirewall.
-    #     Blocks all outbound traffic except the VPN server IP.
-
-    #     Args:
-    #         server_ip (str): The VPN server IP.
-    #     Returns:
-    #         str: Success message.
-    #     """
-    #     try:
-    #         if not server_ip:
-    #             raise ValueError("server_ip cannot be None or empty.")
-
-    #         ip_firewall = self._resolve_hostname(hostname=server_ip)
-    #         print("Server IP (resolved)", ip_firewall)
-
-    #         logger.info(f"Enabling kill switch on Windows for {ip_firewall}...")
-
-    #         block_cmd = [
-    #             "netsh",
-    #             "advfirewall",
-    #             "firewall",
-    #             "add",
-    #             "rule",
-    #             "name=KillSwitchBlockAll",
-    #             "dir=out",
-    #             "action=block",
-    #             "remoteip=any",
-    #         ]
-    #         res_block = subprocess.run(block_cmd, capture_output=True, text=True)
-    #         if res_block.returncode != 0:
-    #             raise RuntimeError(f"Failed to block all: {res_block.stdout or res_block.stderr}")
-
-    #         allow_cmd = [
-    #             "netsh",
-    #             "advfirewall",
-    #             "firewall",
-    #             "add",
-    #             "rule",
-    #             "name=KillSwitchAllowVPN",
-    #             "dir=out",
-    #             "action=allow",
-    #             f"remoteip={ip_firewall}",
-    #         ]
-    #         res_allow = subprocess.run(allow_cmd, capture_output=True, text=True)
-    #         if res_allow.returncode != 0:
-    #             raise RuntimeError(
-    #                 f"Failed to allow {ip_firewall}: {res_allow.stdout or res_allow.stderr}"
-    #             )
-
-    #         return "Kill switch enabled successfully."
-
-    #     except Exception as exc:
-    #         logger.error(f"Failed to enable kill switch: {exc}")
-    #         raise exc
-
-    # def disable_kill_switch(
-    #     self,
-    #     server_ip: Optional[str] = None,
-    #     username: Optional[str] = None,
-    #     password: Optional[str] = None,
-    #     psk: Optional[str] = None,
-    # ) -> str:
-    #     """
-    #     Remove kill-switch rules.
-
-    #     Args:
-    #         server_ip (str): The VPN server IP.
-
-    #     Returns:
-    #         str: Success message.
-    #     """
-    #     try:
-    #         logger.info("Disabling kill switch on Windows.")
-
-    #         remove_block = [
-    #             "netsh",
-    #             "advfirewall",
-    #             "firewall",
-    #             "delete",
-    #             "rule",
-    #             "name=KillSwitchBlockAll",
-    #         ]
-    #         res_block = subprocess.run(remove_block, capture_output=True, text=True)
-
-    #         remove_allow = [
-    #             "netsh",
-    #             "advfirewall",
-    #             "firewall",
-    #             "delete",
-    #             "rule",
-    #             "name=KillSwitchAllowVPN",
-    #         ]
-    #         res_allow = subprocess.run(remove_allow, capture_output=True, text=True)
-
-    #         return "Kill switch disabled successfully."
-    #     except Exception as exc:
-    #         logger.error(f"Failed to disable kill switch: {exc}")
-    #         raise exc
-
-    # def enable_kill_switch(self, *args, **kwargs) -> str:
-    #     """ """
-    #     try:
-
-    #         adapters_to_disable = ["Ethernet", "WiFi"]
-
-    #         for adapter in adapters_to_disable:
-    #             cmd = ["netsh", "interface", "set", "interface", adapter, "admin=disabled"]
-    #             result = subprocess.run(cmd, capture_output=True, text=True)
-    #             if result.returncode != 0:
-    #                 raise RuntimeError(
-    #                     f"Failed to disable adapter '{adapter}': {result.stdout or result.stderr}"
-    #                 )
-
-    #         return "Kill switch enabled by disabling network adapters."
-
-    #     except Exception as exc:
-    #         logger.error(f"Failed to enable kill switch (disable adapters): {exc}")
-    #         raise exc
-
-    # def disable_kill_switch(self, *args, **kwargs) -> str:
-    #     """ """
-    #     try:
-    #         adapters_to_enable = ["Ethernet", "Wi-Fi"]
-
-    #         for adapter in adapters_to_enable:
-    #             cmd = ["netsh", "interface", "set", "interface", adapter, "admin=enabled"]
-    #             result = subprocess.run(cmd, capture_output=True, text=True)
-
-    #             if result.returncode != 0:
-    #                 raise RuntimeError(
-    #                     f"Failed to enable adapter '{adapter}': {result.stdout or result.stderr}"
-    #                 )
-
-    #         return "Kill switch disabled by enabling network adapters."
-    #     except Exception as exc:
-    #         logger.error(f"Failed to disable kill switch (enable adapters): {exc}")
-    #         raise exc
+        Returns:
+            str: Success message.
+        """
+        async with self._mutation_lock:
+            return await self._remove_kill_switch()
@@ -1,4 +1,9 @@
-from typing import Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.status import HTTP_502_BAD_GATEWAY
 
 from core.services.packer import Packer
 from core.services.parser import Parser
@@ -9,11 +14,71 @@ from utils.reusable.vars import request_url
 class VPNGateHandler:
     """
     Python class that handles the data from the vpngate.net website.
+
+    The transformed server list is kept in memory for SERVERS_CACHE_TTL seconds,
+    together with the results of the last QUERY_CACHE_SIZE (search, sort_by,
+    order_by) queries made against it. Once stale, refresh_if_stale() fetches the
+    CSV again.
     """
 
+    SERVERS_CACHE_TTL = 60.0
+    # search is free-form client input, so only the most recently used query
+    # results are kept.
+    QUERY_CACHE_SIZE = 32
+
     def __init__(self, parser: Parser, packer: Packer):
         self.parser = parser
         self.packer = packer
+        self._cache: OrderedDict[Tuple, List[Dict[str, str]]] = OrderedDict()
+        self._raw_cache: Optional[Tuple[float, List[Dict[str, str]]]] = None
+
+    def _get_raw_servers(self) -> List[Dict[str, str]]:
+        """
+        Returns the transformed (unsorted, unfiltered) server list, parsing the
+        packer's current content on first use. Fetching new content is left to
+        refresh_if_stale(), so nothing here blocks the event loop on the network.
+        The list is only cached once the content was parsed successfully.
+
+        Raises:
+            ValueError: If the fetched content is missing or empty.
+        """
+        if self._raw_cache is None:
+            self._raw_cache = (time.monotonic(), self.packer.parsed_rows())
+            self._cache.clear()
+        return self._raw_cache[1]
+
+    def has_servers(self) -> bool:
+        """
+        Whether there is a server list to serve, either already parsed or as
+        fetched content that get_vpn_servers() will parse.
+        """
+        return self._raw_cache is not None or self.packer.content is not None
+
+    def is_stale(self) -> bool:
+        """
+        Whether refresh_if_stale() would fetch: the server list is older than
+        SERVERS_CACHE_TTL, or there is none at all.
+        """
+        if self._raw_cache is None:
+            return self.packer.content is None
+        return time.monotonic() - self._raw_cache[0] >= self.SERVERS_CACHE_TTL
+
+    async def refresh_if_stale(self) -> None:
+        """
+        Refetches the CSV through the async parser once the cached server list is
+        older than SERVERS_CACHE_TTL, or when there is no list because the last
+        fetch failed. The next get_vpn_servers() call parses the new content.
+        If the fetch fails again, the current list (if any) keeps being served.
+        """
+        if not self.is_stale():
+            return
+
+        content = await self.parser.parse_url_lines()
+        if not content:
+            return
+        self.packer.content = content
+        self._raw_cache = None
+        self._cache.clear()
 
     def get_vpn_servers(
         self,
@@ -23,10 +88,28 @@ class VPNGateHandler:
     ) -> List[Dict[str, str]]:
         """
         Returns the VPN servers from the vpngate.net website.
+
+        Raises:
+            HTTPException: 502 if the server list couldn't be fetched or processed.
         """
         try:
-            return self.packer.transform_content(
-                search=search, sort_by=sort_by, order_by=order_by
-            )
+            servers = self._get_raw_servers()
+
+            key = (search, sort_by, order_by)
+            result = self._cache.get(key)
+            if result is None:
+                result = self._cache[key] = self.packer.apply_query(
+                    data=servers, search=search, sort_by=sort_by, order_by=order_by
+                )
+                if len(self._cache) > self.QUERY_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            return result
         except Exception as exc:
-            return {"You've got an error in getting vpn server list method, ": str(exc)}
+            # A dict here would be rejected by the List response model and reach the
+            # client as a 400; report the upstream failure as a 502 instead.
+            raise HTTPException(
+                status_code=HTTP_502_BAD_GATEWAY,
+                detail=f"You've got an error in getting vpn server list method: {exc}",
+            )
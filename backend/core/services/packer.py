@@ -1,14 +1,18 @@
-import traceback
-from pprint import pformat
-from typing import Dict, List, Optional
+import csv
+import json
+import logging
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from fastapi import HTTPException
 
-from utils.reusable.filters import filters_VPN_GATE
-from utils.reusable.restricted_countries import RestrictedCountries
+from utils.reusable.filters import filters_VPN_GATE_set
+from utils.reusable.restricted_countries import restricted_countries_set
 from utils.reusable.sort_directions import SortDirection
 from utils.reusable.sorted_keys import SortField
 
+logger = logging.getLogger(__name__)
+
 
 class Packer:
     """
@@ -24,9 +28,131 @@ class Packer:
       Uptime,TotalUsers,TotalTraffic,LogType,Operator,Message,OpenVPN_ConfigData_Base64
     """
 
-    def __init__(self, content: str):
+    def __init__(self, content: Union[str, List[str]]):
         self.content = content
 
+    @property
+    def content(self) -> Union[str, List[str], None]:
+        """
+        The raw CSV, either as one string or already split into lines (as streamed
+        by Parser.parse_url_lines()). It is released once parsed, so this returns
+        None after the first successful transform_content() call.
+        """
+        return self._content
+
+    @content.setter
+    def content(self, value: Union[str, List[str], None]) -> None:
+        self._content = value
+        self._rows: Optional[List[Dict[str, str]]] = None
+
+    @staticmethod
+    def _column_index(headers: List[str], name: str) -> Optional[int]:
+        """
+        Returns the position of an allowed column in the CSV header, or None
+        if it is missing or not allowed.
+        """
+        if name in filters_VPN_GATE_set and name in headers:
+            return headers.index(name)
+        return None
+
+    @staticmethod
+    def _cell(row: List[str], index: Optional[int]) -> str:
+        """
+        Returns the raw CSV value at index, or "" if the row has no such column.
+        """
+        if index is None or index >= len(row):
+            return ""
+        return row[index]
+
+    @staticmethod
+    def _row_builder(
+        keep: List[Tuple[int, str]],
+    ) -> Callable[[List[str]], Dict[str, str]]:
+        """
+        Returns a function turning a raw CSV row into a dict of the kept columns.
+
+        Full-width rows go through a single itemgetter call; short (malformed) rows
+        fall back to a bounds-checked lookup and only get the columns they have.
+        """
+        names = tuple(header for _, header in keep)
+        indices = [index for index, _ in keep]
+        needed = max(indices, default=-1) + 1
+        getter = itemgetter(*indices) if len(indices) > 1 else None
+
+        def to_dict(row: List[str]) -> Dict[str, str]:
+            if getter is not None and len(row) >= needed:
+                return dict(zip(names, getter(row)))
+            return {header: row[index] for index, header in keep if index < len(row)}
+
+        return to_dict
+
+    def _parse_rows(self) -> List[Dict[str, str]]:
+        """
+        Parses the CSV content into rows with only the allowed fields, without the
+        trailing "*" marker row and without servers from restricted countries.
+
+        The result is kept and the raw content is dropped, so each payload is parsed
+        once no matter how many queries are run against it.
+
+        Returns:
+            A list of dictionaries representing the CSV rows.
+
+        Raises:
+            ValueError: If there is no content, or it has no header row.
+        """
+        if self._rows is not None:
+            return self._rows
+        if self._content is None:
+            raise ValueError("No CSV content to parse")
+
+        # csv.reader is implemented in C and also handles quoted fields correctly.
+        # Rows are consumed lazily, so full-width rows are never all kept in memory.
+        lines = (
+            self._content.splitlines()
+            if isinstance(self._content, str)
+            else self._content
+        )
+        rows = csv.reader(lines)
+        next(rows, None)  # "*vpn_servers" banner
+        headers = next(rows, None)
+        if headers is None:
+            raise ValueError("CSV content has no header row")
+
+        # The allow-list lookup is done once per column, not once per cell.
+        keep = [
+            (index, header)
+            for index, header in enumerate(headers)
+            if header in filters_VPN_GATE_set
+        ]
+
+        # The "*" marker row and restricted countries are skipped on the raw
+        # row, in the same pass, so no dict is built for a dropped row.
+        host_index = self._column_index(headers, "#HostName")
+        country_index = self._column_index(headers, "CountryShort")
+
+        to_dict = self._row_builder(keep)
+        parsed = [
+            to_dict(row)
+            for row in rows
+            if row
+            and self._cell(row, host_index).strip() != "*"
+            and self._cell(row, country_index) not in restricted_countries_set
+        ]
+
+        self._rows = parsed
+        self._content = None
+        return parsed
+
+    def parsed_rows(self) -> List[Dict[str, str]]:
+        """
+        Returns a copy of the parsed rows (see _parse_rows). Unlike
+        transform_content(), a parsing failure is raised instead of turned into [].
+
+        Raises:
+            ValueError: If there is no content, or it has no header row.
+        """
+        return list(self._parse_rows())
+
     def transform_content(
         self,
         search: Optional[str] = None,
@@ -35,54 +161,47 @@ class Packer:
     ) -> List[Dict[str, str]]:
         """
         Transforms the CSV content into a list of dictionaries, keeping only the allowed fields.
+        The CSV itself is parsed only on the first call (see _parse_rows).
 
         Returns:
             A list of dictionaries representing the filtered CSV rows.
             Returns an empty list if an error occurs.
         """
         try:
-            # TODO: separate this code to functions, try to make it more human-readable as well...
-            csv_lines = self.content.split("\n")
-            if len(csv_lines) < 2:
-                return []
-
-            header_line = csv_lines[1]
-            headers = header_line.split(",")
+            return self.apply_query(
+                data=self.parsed_rows(),
+                search=search,
+                sort_by=sort_by,
+                order_by=order_by,
+            )
 
-            allowed_fields = set(filters_VPN_GATE)
-
-            allowed_indices = [
-                index
-                for index, header in enumerate(headers)
-                if header in allowed_fields
-            ]
-
-            allowed_header_names = [headers[i] for i in allowed_indices]
-
-            transformed_data: List[Dict[str, str]] = []
+        except Exception as exc:
+            logger.exception("Error in content transformation method")
+            return []
 
-            for line in csv_lines[2:]:
-                if not line.strip():
-                    continue
-                row_values = line.split(",")
-                row_dict = {}
-                for allowed_index, header_name in zip(
-                    allowed_indices, allowed_header_names
-                ):
-                    if allowed_index < len(row_values):
-                        row_dict[header_name] = row_values[allowed_index]
-                transformed_data.append(row_dict)
+    def apply_query(
+        self,
+        data: List[Dict[str, str]],
+        search: Optional[str] = None,
+        sort_by: Optional[str] = None,
+        order_by: Optional[SortDirection] = SortDirection.DESC,
+    ) -> List[Dict[str, str]]:
+        """
+        Applies the hostname search and the sorting to already transformed rows,
+        so callers holding parsed rows don't need to re-parse the CSV.
 
-            transformed_data = [
-                row
-                for row in transformed_data
-                if row.get("#HostName", "").strip() != "*"
-            ]
+        Args:
+            data: A list of dictionaries containing the transformed CSV data.
+            search: Search string (matched against the hostname only).
+            sort_by: The key (or SortField) to sort by.
+            order_by: Sort direction (default is descending).
 
+        Returns:
+            A new list of dictionaries. Returns an empty list if an error occurs.
+        """
+        try:
             if search:
-                transformed_data = self.filter_by_hostname(
-                    data=transformed_data, search=search
-                )
+                data = self.filter_by_hostname(data=data, search=search)
 
             if sort_by:
                 sort_field = (
@@ -90,18 +209,15 @@ class Packer:
                     if isinstance(sort_by, SortField)
                     else SortField.from_key(sort_by)
                 )
-                transformed_data = self.sort_content(
-                    data=transformed_data,
+                data = self.sort_content(
+                    data=data,
                     direction=order_by if order_by else SortDirection.DESC,
                     sort_key=sort_field,
                 )
 
-            transformed_data = self.remove_restricted_countries(data=transformed_data)
-            return transformed_data
-
+            return data
         except Exception as exc:
-            print("Error in content trasnformation method: ", str(exc))
-            traceback.print_exc()
+            logger.exception("Error in applying search and sort to content")
             return []
 
     def sort_text(
@@ -175,8 +291,7 @@ class Packer:
             else:
                 return self.sort_text(data, key_name, reverse)
         except Exception as exc:
-            print("Error in sorting content method: ", str(exc))
-            traceback.print_exc()
+            logger.exception("Error in sorting content method")
             return []
 
     def filter_by_hostname(
@@ -193,14 +308,10 @@ class Packer:
             A sorted list of dictionaries.
         """
         try:
-            result = []
-            for row in data:
-                if search.lower() in row.get("#HostName", "").lower():
-                    result.append(row)
-            return result
+            needle = search.lower()
+            return [row for row in data if needle in row.get("#HostName", "").lower()]
         except Exception as exc:
-            print("Error in filtering content method: ", str(exc))
-            traceback.print_exc()
+            logger.exception("Error in filtering content method")
             return []
 
     def remove_restricted_countries(
@@ -217,19 +328,21 @@ class Packer:
             A list of dictionaries containing the filtered data.
         """
         try:
-            restricted = [country.value for country in RestrictedCountries]
             filtered_data = [
-                row for row in data if row.get("CountryShort", "") not in restricted
+                row
+                for row in data
+                if row.get("CountryShort", "") not in restricted_countries_set
             ]
             return filtered_data
         except Exception as exc:
-            print("Error in filtering out restricted countries: ", str(exc))
-            traceback.print_exc()
+            logger.exception("Error in filtering out restricted countries")
             return []
 
     def format_content(self, data: List[Dict[str, str]]) -> str:
         """
-        Formats the transformed data into a pretty string representation.
+        Formats the transformed data into an indented JSON string.
+        Meant for debugging only: API responses return the list itself
+        and leave serialization to FastAPI.
 
         Args:
             data: A list of dictionaries containing the transformed CSV data.
@@ -237,4 +350,4 @@ class Packer:
         Returns:
             A formatted string for easy reading.
         """
-        return pformat(data, indent=2, width=80)
+        return json.dumps(data, indent=2, ensure_ascii=False)
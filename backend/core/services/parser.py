@@ -1,7 +1,36 @@
+import logging
+from typing import List, Optional
+
+import httpx
 from requests import request
 
+logger = logging.getLogger(__name__)
+
+# One connection pool for every async fetch, so repeated refreshes reuse the
+# keep-alive connection (and its TLS session) to the same host.
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared httpx.AsyncClient, creating it on first use.
+    """
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """
+    Closes the shared httpx.AsyncClient, if one was created. Called on app shutdown.
+    """
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
 
-# TODO: make it async ?
 class Parser:
     """
     Simple python class that parses data from a given URL.
@@ -13,6 +42,9 @@ class Parser:
     Methods:
         parseURL() -> str
             Parses the data from the given URL.
+        parse_url_lines() -> List[str]
+            Async version of parseURL() that doesn't block the event loop. Streams
+            the body and returns it line by line.
     """
 
     def __init__(self, url: str):
@@ -26,7 +58,23 @@ class Parser:
             str: The parsed data
         """
         try:
-            response = request("GET", self.url)
+            response = request("GET", self.url, timeout=30.0)
+            response.raise_for_status()
             return response.text
-        except Exception as exc:
-            print(f"An error occurred: {exc}")
+        except Exception:
+            logger.exception(f"Failed to fetch {self.url}")
+
+    async def parse_url_lines(self) -> Optional[List[str]]:
+        """
+        Streams the data from the given URL and returns it split into lines, so the
+        whole body is never held as one string next to its split copy.
+
+        Returns:
+            Optional[List[str]]: The lines of the parsed data, or None if the request failed.
+        """
+        try:
+            async with _get_async_client().stream("GET", self.url) as response:
+                response.raise_for_status()
+                return [line async for line in response.aiter_lines()]
+        except Exception:
+            logger.exception(f"Failed to fetch {self.url}")
@@ -1,19 +1,40 @@
+import asyncio
+from typing import Optional
+
 from core.services.handler import VPNGateHandler
 from core.services.packer import Packer
 from core.services.parser import Parser
 from utils.reusable.vars import request_url
 
+# The process-wide handler; built on the first request and reused afterwards.
+_shared_handler: Optional[VPNGateHandler] = None
+# The one in-flight refetch of the vpngate CSV, shared by every request.
+_refresh_task: Optional[asyncio.Task] = None
+
 
-def get_vpngate_handler() -> VPNGateHandler:
+async def get_vpngate_handler() -> VPNGateHandler:
     """
     Fabric method to get VPNGateHandler instance with all needed dependencies.
+    Every request shares the same handler (and so its cached server list). Once
+    that list is stale, a single background task downloads the vpngate CSV
+    asynchronously while requests keep being served the current list; only when
+    there is no list yet do they wait for the download.
     """
+    global _shared_handler, _refresh_task
     try:
+        # Nothing is awaited before the handler is stored, so concurrent requests
+        # can't build two of them.
+        if _shared_handler is None:
+            _shared_handler = VPNGateHandler(
+                parser=Parser(request_url), packer=Packer(None)
+            )
+        handler = _shared_handler
 
-        parser = Parser(request_url)
-        packer = Packer(parser.parseURL())
-
-        handler = VPNGateHandler(parser=parser, packer=packer)
+        if handler.is_stale() and (_refresh_task is None or _refresh_task.done()):
+            _refresh_task = asyncio.create_task(handler.refresh_if_stale())
+        if not handler.has_servers():
+            # shield: a cancelled request mustn't cancel the download others wait on.
+            await asyncio.shield(_refresh_task)
 
         return handler
     except Exception as exc:
@@ -4,6 +4,7 @@ Python module that returns correct VPN Manager class instance depending on the O
 
 import logging
 import platform
+from typing import Dict, Type
 
 from fastapi import Depends
 
@@ -14,6 +15,12 @@ from utils.reusable.vpn_implementations import VpnImplementation
 
 logger = logging.getLogger(__name__)
 
+# Connector class per lowercased platform.system() name.
+_CONNECTORS: Dict[str, Type[IVpnConnector]] = {
+    "windows": WindowsL2TPConnector,
+    "darwin": MacOSL2TPConnector,
+}
+
 
 def get_vpn_connector() -> IVpnConnector:
     """
@@ -25,10 +32,9 @@ def get_vpn_connector() -> IVpnConnector:
     """
     try:
         os_name = platform.system().lower()  # e.g. 'windows', 'darwin', 'linux'
-        if os_name == "windows":
-            return WindowsL2TPConnector()
-        elif os_name == "darwin":
-            return MacOSL2TPConnector()
+        connector_cls = _CONNECTORS.get(os_name)
+        if connector_cls is not None:
+            return connector_cls()
         elif os_name == "linux":
             raise NotImplementedError("Linux not implemented yet")
         else:
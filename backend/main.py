@@ -1,5 +1,5 @@
-import ctypes
 import multiprocessing
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import APIRouter, FastAPI, Request
@@ -8,8 +8,19 @@ from fastapi.responses import JSONResponse
 from starlette.status import HTTP_400_BAD_REQUEST
 
 from api.router.router import main_router
+from core.services.parser import close_async_client
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Closes the shared HTTP client used for the server list fetches on shutdown.
+    """
+    yield
+    await close_async_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 @app.exception_handler(HTTPException)
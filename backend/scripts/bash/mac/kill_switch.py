@@ -32,16 +32,18 @@ class ConfScriptsPaths(Enum):
     PASS_ALL_CONF = (SCRIPTS_DIR / "passall.conf").as_posix()
 
 
+# Script paths, joined once at import instead of on every enable/disable call.
+_SCRIPT_PATHS = {name: str(SCRIPTS_DIR / name.value) for name in ScriptsNames}
+
+
 async def enable_kill_switch() -> str:
     """
     Function to enable the kill switch using a bash script.
     """
     try:
-        script_path = SCRIPTS_DIR / ScriptsNames.ENABLE_KILL_SWITCH.value
-
         proc = await asyncio.create_subprocess_exec(
             "bash",
-            str(script_path),
+            _SCRIPT_PATHS[ScriptsNames.ENABLE_KILL_SWITCH],
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
@@ -65,11 +67,9 @@ async def disable_kill_switch() -> str:
     Function to disable the kill switch using a bash script.
     """
     try:
-        script_path = SCRIPTS_DIR / ScriptsNames.DISABLE_KILL_SWITCH.value
-
         proc = await asyncio.create_subprocess_exec(
             "bash",
-            str(script_path),
+            _SCRIPT_PATHS[ScriptsNames.DISABLE_KILL_SWITCH],
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
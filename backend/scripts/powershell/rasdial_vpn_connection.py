@@ -4,6 +4,7 @@ Python module that stores the mapping of reusable terminal commands for VPN exec
 """
 
 from enum import Enum
+from textwrap import dedent
 
 
 class RasdialL2TP_Scripts(Enum):
@@ -19,9 +20,12 @@ class RasdialL2TP_Scripts(Enum):
 
         SET_VPN_DNS_SERVERS (str): PowerShell script to set the DNS servers for the VPN connection.
 
+    The scripts are dedented and stripped once here, so no source indentation is
+    passed on to powershell.exe.
+
     """
 
-    ADD_VPN_CONNECTION_SCRIPT = """
+    ADD_VPN_CONNECTION_SCRIPT = dedent("""
         try {{
             Import-Module RemoteAccess -ErrorAction SilentlyContinue
             Add-VpnConnection -Name '{name}' -ServerAddress '{server_ip}' -TunnelType L2TP -L2tpPsk '{psk}' `
@@ -32,25 +36,25 @@ class RasdialL2TP_Scripts(Enum):
             Write-Host ("Error: " + $_.Exception.Message)
             exit 1
         }}
-    """
+        """).strip()
 
-    SET_VPN_CONNECTION_SCRIPT = """
+    SET_VPN_CONNECTION_SCRIPT = dedent("""
         try {{
-                Import-Module RemoteAccess -ErrorAction SilentlyContinue
-                Set-VpnConnection -Name '{name}' -ServerAddress '{server_ip}' -TunnelType L2TP -L2tpPsk '{psk}' `
-                    -AuthenticationMethod Pap,CHAP,MSCHAPv2 -AllUserConnection -Force -ErrorAction Stop
-                Write-Host "Set-VpnConnection completed successfully."
-            }}
-            catch {{
-                Write-Host ("Error: " + $_.Exception.Message)
-                exit 1
-            }}
-    """
+            Import-Module RemoteAccess -ErrorAction SilentlyContinue
+            Set-VpnConnection -Name '{name}' -ServerAddress '{server_ip}' -TunnelType L2TP -L2tpPsk '{psk}' `
+                -AuthenticationMethod Pap,CHAP,MSCHAPv2 -AllUserConnection -Force -ErrorAction Stop
+            Write-Host "Set-VpnConnection completed successfully."
+        }}
+        catch {{
+            Write-Host ("Error: " + $_.Exception.Message)
+            exit 1
+        }}
+        """).strip()
 
-    SET_SPLIT_TUNNELING_OFF = """
-        Set-VpnConnection -Name "{name}" -SplitTunneling $False -PassThru
-    """
+    SET_SPLIT_TUNNELING_OFF = (
+        """Set-VpnConnection -Name "{name}" -SplitTunneling $False -PassThru"""
+    )
 
-    SET_VPN_DNS_SERVERS = """
-        Set-VpnConnection -Name "{name}" -DnsServer {dns_servers} -PassThru
-    """
+    SET_VPN_DNS_SERVERS = (
+        """Set-VpnConnection -Name "{name}" -DnsServer {dns_servers} -PassThru"""
+    )
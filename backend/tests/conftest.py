@@ -1,7 +1,10 @@
 import subprocess
+import sys
 from pathlib import Path
+from unittest.mock import AsyncMock
 
 import pytest
+from fastapi.testclient import TestClient
 
 from core.services.handler import VPNGateHandler
 from core.services.packer import Packer
@@ -9,16 +12,43 @@ from core.services.parser import Parser
 from utils.reusable.vars import request_url
 
 
-@pytest.fixture
+def pytest_configure(config):
+    """
+    Registers the marker used to serialize tests that share system state, so it
+    is known even when pytest-xdist isn't installed.
+    """
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): run all tests of the group on the same xdist worker",
+    )
+
+
+@pytest.fixture(scope="session")
 def sample_csv() -> str:
     """
     Reads CSV data from the file `vpngate_mock.csv` and returns it as a string.
     This fixture is used to provide sample CSV data for testing purposes.
+    The file is read once per test session; strings are immutable, so sharing is safe.
     """
     csv_path = Path(__file__).parent / "mock_data" / "vpngate_mock.csv"
     return csv_path.read_text(encoding="utf-8")
 
 
+@pytest.fixture(scope="session")
+def api_client():
+    """
+    A TestClient for the FastAPI app, built once per test session and shared by
+    the endpoint tests. The context manager form runs the app's startup and
+    shutdown exactly once.
+    """
+    # Imported here: importing the app builds the OS-specific connector, so a
+    # module-level import would break every test on an unsupported platform.
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
 @pytest.fixture
 def sample_packer(sample_csv):
     """
@@ -50,11 +80,40 @@ def mocked_parser(sample_csv):
     return parser
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture
+def fake_subprocess(monkeypatch):
+    """
+    Returns a factory that patches asyncio.create_subprocess_exec for the current
+    test with a process exiting with the given code and (stdout, stderr).
+    """
+
+    def _make(returncode: int = 0, stdout: bytes = b"", stderr: bytes = b""):
+        mock_proc = AsyncMock()
+        mock_proc.returncode = returncode
+        mock_proc.communicate.return_value = (stdout, stderr)
+        monkeypatch.setattr(
+            "asyncio.create_subprocess_exec", AsyncMock(return_value=mock_proc)
+        )
+        return mock_proc
+
+    return _make
+
+
+@pytest.fixture
 def ensure_pf_disabled():
     """
     Fixture to ensure that pf is disabled (pfctl -d) after test completes,
     so we don't leave kill-switch active on the system.
+
+    Opt-in: only tests that really drive pfctl request it (see
+    tests/connectors/test_macos_connector_kill_switch.py), so mocked tests don't
+    spawn sudo after every run. `sudo -n` never waits on a password prompt.
     """
     yield
-    subprocess.run(["sudo", "pfctl", "-d"], check=False)
+    if sys.platform == "darwin":
+        subprocess.run(
+            ["sudo", "-n", "pfctl", "-d"],
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
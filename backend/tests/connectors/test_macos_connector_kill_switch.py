@@ -1,82 +1,94 @@
-"""Module: test_macos_connector_kill_switch
-========================================
-
-This module contains an integration test for the `MacOSL2TPConnector` class, specifically testing
-the VPN kill-switch functionality on macOS. The test interacts with real system components such as
-`scutil` and `pfctl`, requiring elevated privileges and specific system configurations to run.
-
-The test verifies the following:
-1. The ability to connect to a VPN with the kill-switch enabled.
-2. The VPN connection status after connecting.
-3. Traffic routing through the VPN by pinging an external IP.
-4. The behavior of the kill-switch when the VPN is disconnected, ensuring traffic is blocked.
-5. The ability to disable the kill-switch and restore normal traffic.
-
-**Requirements:**
-- A real L2TP service named "MyL2TP" configured in macOS Network settings.
-- The "Send all traffic over VPN" option enabled for the L2TP service.
-- `pfctl` must not prompt for a password (use `NOPASSWD` in sudoers or run the test as sudo).
-- A stable external host to ping (e.g., 8.8.8.8).
-
-**Note:** This test requires root privileges to execute and should be run with caution as it modifies
-network settings and firewall rules.
-
-Dependencies:
-- pytest
-- asyncio
-- subprocess
-- os
-
-
-    Integration test for the `MacOSL2TPConnector` class with real `scutil` and `pfctl` calls.
-    This test ensures the VPN kill-switch functionality works as expected.
-
-    **Test Steps:**
-    1. Connect to the VPN with the kill-switch enabled.
-    2. Verify the VPN connection status is "Connected".
-    3. Ping an external IP (e.g., 8.8.8.8) to confirm traffic is routed through the VPN.
-    4. Disconnect the VPN while keeping the kill-switch monitor active.
-    5. Wait for the kill-switch monitor to detect the disconnection and block traffic.
-    6. Attempt to ping the external IP again, expecting it to fail due to the kill-switch.
-    7. Disable the kill-switch and stop the monitor to restore normal traffic.
-
-    **Parameters:**
-    None
-
-    **Returns:**
-    None
-
-    **Raises:**
-    - `pytest.fail`: If any step in the test fails, an appropriate error message is logged, and the test is marked as failed.
-
-    **Preconditions:**
-    - A real L2TP VPN service named "MyL2TP" must be configured in macOS Network settings.
-    - The "Send all traffic over VPN" option must be enabled for the VPN service.
-    - The `pfctl` command must not prompt for a password (use `NOPASSWD` in sudoers or run the test as sudo).
-    - A stable external host (e.g., 8.8.8.8) must be reachable for ping tests.
-
-    **Postconditions:**
-    - The VPN kill-switch is disabled, and the monitor is stopped, restoring normal traffic routing.
-
-    **Important Notes:**
-    - This test modifies system network settings and firewall rules. Ensure you understand the implications
-      before running it on a production system.
-    - The test requires root privileges to execute."""
+"""
+Integration tests for MacOSL2TPConnector's kill switch, run against the real
+scutil and pfctl. They need root, a real L2TP service named "MyL2TP" with
+"Send all traffic over VPN" enabled, and a reachable host to ping (8.8.8.8).
+They change firewall rules, so don't run them on a machine you rely on.
+"""
 
 import asyncio
 import os
-import subprocess
-import time
+import re
+import shutil
+from typing import Tuple
 
 import pytest
+from fastapi.testclient import TestClient
 
 from core.managers.vpn_manager_macos import MacOSL2TPConnector
 
+# Checked once for every root-only test below.
+_IS_ROOT = os.geteuid() == 0
+
+# All tests here share the system pf state and the MyL2TP service; under
+# `pytest -n auto --dist loadgroup` they are kept together on one xdist worker.
+pytestmark = pytest.mark.xdist_group("pf_firewall")
+
+# ping's summary when no reply came back. The word boundary keeps
+# "10 packets received" from matching.
+_PING_NO_REPLY = re.compile(rb"\b0 packets received")
+# Prefix of a successful disconnect() result.
+_DISCONNECT_OK = "Disconnected VPN"
+# ping resolved to an absolute path once: together with close_fds=False this
+# lets subprocess start it with posix_spawn instead of fork+exec.
+_PING = shutil.which("ping") or "/sbin/ping"
+
+
+def _watch_kill_switch_attempts(connector: MacOSL2TPConnector) -> asyncio.Event:
+    """
+    Wraps the connector's enable/disable_kill_switch so the returned event is set
+    after every pfctl attempt, failed ones included. Tests wait on it for the
+    kill-switch monitor's reaction instead of sleeping for a fixed time.
+    """
+    attempted = asyncio.Event()
+    for name in ("enable_kill_switch", "disable_kill_switch"):
+        original = getattr(connector, name)
+
+        async def _wrapped(*args, _original=original, **kwargs):
+            try:
+                return await _original(*args, **kwargs)
+            finally:
+                attempted.set()
+
+        setattr(connector, name, _wrapped)
+    return attempted
+
+
+async def _ping(host: str, count: int, wait: int, timeout: float) -> Tuple[int, bytes]:
+    """
+    Pings the host without blocking the event loop, so the kill-switch monitor keeps
+    polling meanwhile. On timeout ping is killed and asyncio.TimeoutError is raised.
+    Probes are sent 0.2s apart (allowed for root, which these tests require) rather
+    than ping's default 1s, so a probe takes a fraction of the time.
+
+    Returns:
+        Tuple[int, bytes]: ping's exit code and its stdout.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        _PING,
+        "-c",
+        str(count),
+        "-W",
+        str(wait),
+        "-i",
+        "0.2",
+        host,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        close_fds=False,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout
+
 
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("ensure_pf_disabled")
 @pytest.mark.skipif(
-    os.geteuid() != 0, reason="Requires root privileges (sudo) to run pfctl."
+    not _IS_ROOT, reason="Requires root privileges (sudo) to run pfctl."
 )
 async def test_integration_vpn_kill_switch():
     """
@@ -113,12 +125,11 @@ async def test_integration_vpn_kill_switch():
 
     print("[TEST] 2) Attempting to ping 8.8.8.8 to verify traffic over VPN...")
     try:
-        output = subprocess.check_output(
-            ["ping", "-c", "4", "-W", "5", "8.8.8.8"],
-            timeout=15,
-        )
+        returncode, output = await _ping("8.8.8.8", count=4, wait=5, timeout=15)
+        if returncode != 0:
+            pytest.fail(f"[TEST] Ping exited with {returncode} while VPN is connected.")
         print(f"[TEST] Ping output:\n{output.decode('utf-8')}")
-        if b"0 packets received" in output:
+        if _PING_NO_REPLY.search(output):
             pytest.fail(
                 "[TEST] Ping returned 0 packets received while VPN is connected."
             )
@@ -129,7 +140,7 @@ async def test_integration_vpn_kill_switch():
     try:
         disc_result = await connector.disconnect()
         print(f"[TEST] Disconnect result: {disc_result}")
-        assert "Disconnected VPN" in disc_result, "disconnect() should return success."
+        assert _DISCONNECT_OK in disc_result, "disconnect() should return success."
     except Exception as e:
         pytest.fail(f"[TEST] Failed to disconnect: {e}")
 
@@ -141,15 +152,15 @@ async def test_integration_vpn_kill_switch():
     print("[TEST] 5) Attempting ping again – it should fail if kill-switch is active.")
     ping_failed = False
     try:
-        output = subprocess.check_output(
-            ["ping", "-c", "2", "-W", "2", "8.8.8.8"], timeout=10
-        )
-        print("[TEST] Ping output after disconnect:\n", output.decode("utf-8"))
-        # If we got here, ping surprisingly succeeded
-    except subprocess.CalledProcessError:
-        print("[TEST] Ping returned non-zero exit code -> means it was blocked. Good!")
-        ping_failed = True
-    except subprocess.TimeoutExpired:
+        returncode, output = await _ping("8.8.8.8", count=2, wait=2, timeout=10)
+        if returncode != 0:
+            print(
+                "[TEST] Ping returned non-zero exit code -> means it was blocked. Good!"
+            )
+            ping_failed = True
+        else:
+            print("[TEST] Ping output after disconnect:\n", output.decode("utf-8"))
+    except asyncio.TimeoutError:
         print("[TEST] Ping timed out -> also means blocked.")
         ping_failed = True
 
@@ -159,9 +170,12 @@ async def test_integration_vpn_kill_switch():
         "[TEST] 6) Disabling kill-switch to restore normal traffic. Also stopping monitor."
     )
     try:
-        disable_result = await connector.disable_kill_switch()
+        # The monitor only notices the stop flag after its current sleep, so
+        # pf is disabled in the meantime instead of afterwards.
+        disable_result, _ = await asyncio.gather(
+            connector.disable_kill_switch(), connector.stop_kill_switch_monitor()
+        )
         print(f"[TEST] disable_kill_switch result: {disable_result}")
-        await connector.stop_kill_switch_monitor()
         print("[TEST] Stopped kill-switch monitor.")
         assert (
             "disabled" in disable_result.lower()
@@ -175,7 +189,7 @@ async def test_integration_vpn_kill_switch():
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("ensure_pf_disabled")
 @pytest.mark.skipif(
-    os.geteuid() != 0, reason="Requires root privileges (sudo) to run pfctl."
+    not _IS_ROOT, reason="Requires root privileges (sudo) to run pfctl."
 )
 async def test_integration_vpn_kill_switch_forced_drop():
     """
@@ -200,6 +214,7 @@ async def test_integration_vpn_kill_switch_forced_drop():
 
     print("\n[TEST] Starting forced-drop integration test.")
     connector = MacOSL2TPConnector(service_name="MyL2TP")
+    kill_switch_attempted = _watch_kill_switch_attempts(connector)
 
     print("[TEST] 1) Connecting with kill-switch enabled...")
     try:
@@ -214,12 +229,11 @@ async def test_integration_vpn_kill_switch_forced_drop():
 
     print("[TEST] 2) Pinging 8.8.8.8 -> should succeed over VPN.")
     try:
-        output = subprocess.check_output(
-            ["ping", "-c", "4", "-W", "5", "8.8.8.8"],
-            timeout=15,
-        )
+        returncode, output = await _ping("8.8.8.8", count=4, wait=5, timeout=15)
+        if returncode != 0:
+            pytest.fail(f"[TEST] Ping exited with {returncode} while VPN is connected.")
         print("[TEST] Ping output:\n", output.decode("utf-8"))
-        if b"0 packets received" in output:
+        if _PING_NO_REPLY.search(output):
             pytest.fail(
                 "[TEST] Ping returned 0 packets received while VPN is connected."
             )
@@ -229,30 +243,34 @@ async def test_integration_vpn_kill_switch_forced_drop():
     print(
         "[TEST] 3) Forcibly stopping VPN from outside the connector (scutil --nc stop)..."
     )
-    try:
-        subprocess.check_call(["scutil", "--nc", "stop", "MyL2TP"])
-        print("[TEST] scutil stop invoked successfully.")
-    except subprocess.CalledProcessError as e:
-        pytest.fail(f"[TEST] Failed to forcibly stop VPN: {e}")
+    # Cleared before the drop, so the wait below only sees the monitor's reaction to it.
+    kill_switch_attempted.clear()
+    # Spawned on the event loop, so the kill-switch monitor keeps polling meanwhile.
+    proc = await asyncio.create_subprocess_exec("scutil", "--nc", "stop", "MyL2TP")
+    returncode = await proc.wait()
+    if returncode != 0:
+        pytest.fail(
+            f"[TEST] Failed to forcibly stop VPN: scutil exited with {returncode}"
+        )
+    print("[TEST] scutil stop invoked successfully.")
 
     print(
-        "[TEST] 4) Wait 4s for kill-switch monitor to see 'Disconnected' and block traffic."
+        "[TEST] 4) Wait for kill-switch monitor to see 'Disconnected' and block traffic."
     )
-    await asyncio.sleep(4)
+    await asyncio.wait_for(kill_switch_attempted.wait(), timeout=6)
 
     print(
         "[TEST] 5) Attempt ping -> expected to fail since kill-switch should be active."
     )
     ping_failed = False
     try:
-        output = subprocess.check_output(
-            ["ping", "-c", "2", "-W", "2", "8.8.8.8"], timeout=10
-        )
-        print("[TEST] Ping output after forced drop:\n", output.decode("utf-8"))
-    except subprocess.CalledProcessError:
-        print("[TEST] Ping returned non-zero exit code -> means block. Good!")
-        ping_failed = True
-    except subprocess.TimeoutExpired:
+        returncode, output = await _ping("8.8.8.8", count=2, wait=2, timeout=10)
+        if returncode != 0:
+            print("[TEST] Ping returned non-zero exit code -> means block. Good!")
+            ping_failed = True
+        else:
+            print("[TEST] Ping output after forced drop:\n", output.decode("utf-8"))
+    except asyncio.TimeoutError:
         print("[TEST] Ping timed out -> also means block.")
         ping_failed = True
 
@@ -262,9 +280,10 @@ async def test_integration_vpn_kill_switch_forced_drop():
 
     print("[TEST] 6) Disable kill-switch, stop monitor, restore traffic.")
     try:
-        disable_msg = await connector.disable_kill_switch()
+        disable_msg, _ = await asyncio.gather(
+            connector.disable_kill_switch(), connector.stop_kill_switch_monitor()
+        )
         print(f"[TEST] disable_kill_switch result: {disable_msg}")
-        await connector.stop_kill_switch_monitor()
         print("[TEST] Stopped kill-switch monitor.")
         assert "disabled" in disable_msg.lower()
     except Exception as e:
@@ -277,14 +296,16 @@ async def test_integration_vpn_kill_switch_forced_drop():
 
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("ensure_pf_disabled")
-@pytest.mark.skipif(
-    os.geteuid() != 0, reason="Requires root privileges for pfctl tests"
-)
+@pytest.mark.skipif(not _IS_ROOT, reason="Requires root privileges for pfctl tests")
 async def test_integration_wrong_sudo_password():
     """
     Integration test: store a WRONG password in Keychain, then attempt connect with kill_switch_enabled=True.
     Expect pfctl commands to fail once the kill-switch tries to engage.
     """
+    # Imported here: importing the app builds the OS-specific connector, which
+    # would break collection of this module on platforms other than macOS.
+    from main import app
+
     client = TestClient(app)
 
     # 1) Store a definitely wrong sudo password
@@ -295,12 +316,17 @@ async def test_integration_wrong_sudo_password():
     assert "status" in store_resp.json()
 
     connector = MacOSL2TPConnector(service_name="MyL2TP")
+    kill_switch_attempted = _watch_kill_switch_attempts(connector)
     # 2) Attempt to connect with kill_switch_enabled -> eventually monitor tries pfctl
     try:
         connect_msg = await connector.connect(kill_switch_enabled=True)
         print("[TEST] connect_msg:", connect_msg)
-        # Sleep a bit so the monitor might attempt pfctl
-        await asyncio.sleep(4)
+        # Give the monitor up to 4 s for its first pfctl attempt, but move on
+        # as soon as it reports one.
+        try:
+            await asyncio.wait_for(kill_switch_attempted.wait(), timeout=4)
+        except asyncio.TimeoutError:
+            print("[TEST] Monitor made no pfctl attempt while connected.")
     except Exception as exc:
         # If it fails immediately, we catch it
         print("[TEST] Connect raised exception as expected:", exc)
@@ -313,8 +339,6 @@ async def test_integration_wrong_sudo_password():
     try:
         disc_msg = await connector.disconnect()
         print("[TEST] disc_msg:", disc_msg)
-        # Wait a bit so the monitor definitely attempts pfctl
-        await asyncio.sleep(4)
     except Exception as exc:
         # We expect an error at some point
         print(
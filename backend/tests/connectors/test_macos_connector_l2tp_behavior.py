@@ -13,14 +13,25 @@ import pytest
 from core.managers.vpn_manager_macos import MacOSL2TPConnector
 
 
+@pytest.fixture
+def connector():
+    """
+    A fresh connector per test. A kill-switch monitor task left running by the
+    test is cancelled afterwards, so no task leaks into the next test.
+    """
+    instance = MacOSL2TPConnector(service_name="MyL2TP")
+    yield instance
+    task = instance._kill_switch_task
+    if task is not None and not task.done():
+        task.cancel()
+
+
 @pytest.mark.asyncio
-async def test_connect_ok():
+async def test_connect_ok(connector):
     """
     Check that connect() doesn't raise if scutil returns 0
     and status eventually becomes 'Connected' within 10 tries.
     """
-    connector = MacOSL2TPConnector(service_name="MyL2TP")
-
     # Mock scutil start success
     mock_proc = AsyncMock()
     mock_proc.returncode = 0
@@ -36,104 +47,89 @@ async def test_connect_ok():
 
 
 @pytest.mark.asyncio
-async def test_connect_scutil_fail():
+async def test_connect_scutil_fail(connector, fake_subprocess):
     """
     If scutil returns non-zero, connect() should raise RuntimeError.
     """
-    connector = MacOSL2TPConnector(service_name="MyL2TP")
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 2
-    mock_proc.communicate.return_value = (b"", b"scutil error")
+    fake_subprocess(returncode=2, stderr=b"scutil error")
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        with pytest.raises(RuntimeError):
-            await connector.connect()
+    with pytest.raises(RuntimeError):
+        await connector.connect()
 
 
 @pytest.mark.asyncio
-async def test_connect_status_timeout():
+async def test_connect_status_timeout(connector, fake_subprocess):
     """
     If after 30 tries we never see 'Connected', raise RuntimeError.
+    The 1s poll sleep is patched out, so the 30 tries don't take 30 real seconds.
     """
-    connector = MacOSL2TPConnector(service_name="MyL2TP")
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"", b"")
+    fake_subprocess()
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        with patch.object(connector, "status", return_value="Disconnected"):
+    with patch.object(connector, "status", return_value="Disconnected") as mock_status:
+        with patch(
+            "core.managers.vpn_manager_macos.asyncio.sleep", new=AsyncMock()
+        ) as mock_sleep:
             with pytest.raises(
                 RuntimeError, match="VPN did not become 'Connected' after 30s."
             ):
                 await connector.connect()
 
+            assert mock_status.call_count == 30
+            assert mock_sleep.await_count == 30
+
 
 @pytest.mark.asyncio
-async def test_disconnect_ok():
+async def test_disconnect_ok(connector, fake_subprocess):
     """
     Check that disconnect returns expected string on success
     and sets current_vpn_ip to None.
     """
-    connector = MacOSL2TPConnector(service_name="MyL2TP")
     connector.current_vpn_ip = "10.0.0.1"
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"Stopped", b"")
+    fake_subprocess(stdout=b"Stopped")
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        result = await connector.disconnect()
-        assert "Disconnected VPN 'MyL2TP' from 10.0.0.1" in result
-        assert connector.current_vpn_ip is None
+    result = await connector.disconnect()
+    assert "Disconnected VPN 'MyL2TP' from 10.0.0.1" in result
+    assert connector.current_vpn_ip is None
 
 
 @pytest.mark.asyncio
-async def test_disconnect_none():
+async def test_disconnect_none(connector):
     """
     If current_vpn_ip is None, method returns "No active VPN connection..."
     """
-    connector = MacOSL2TPConnector(service_name="MyL2TP")
     connector.current_vpn_ip = None
     result = await connector.disconnect()
     assert result == "No active VPN connection to disconnect from."
 
 
 @pytest.mark.asyncio
-async def test_status_connected():
+async def test_status_connected(connector, fake_subprocess):
     """
     If scutil --nc status returns output containing 'connected',
     we parse it as 'Connected'.
     """
-    connector = MacOSL2TPConnector(service_name="MyL2TP")
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"Status: Connected", b"")
+    fake_subprocess(stdout=b"Status: Connected")
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        st = await connector.status()
-        assert st == "Connected"
+    st = await connector.status()
+    assert st == "Connected"
 
 
 @pytest.mark.asyncio
-async def test_enable_kill_switch_ok():
+async def test_enable_kill_switch_ok(connector, fake_subprocess):
     """
     If pfctl returns 0, we confirm success message.
     """
-    connector = MacOSL2TPConnector()
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"Kill switch enabled", b"")
+    fake_subprocess(stdout=b"Kill switch enabled")
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        out = await connector.enable_kill_switch()
-        assert "Kill switch enabled" in out
+    out = await connector.enable_kill_switch()
+    assert "Kill switch enabled" in out
 
 
 @pytest.mark.asyncio
-async def test_enable_kill_switch_fail():
+async def test_enable_kill_switch_fail(connector):
     """
     If pfctl fails, we raise RuntimeError.
     """
-    connector = MacOSL2TPConnector()
 
     with patch("subprocess.run") as mock_run:
         fake_completed = MagicMock()
@@ -147,3 +143,21 @@ async def test_enable_kill_switch_fail():
             match=r"Failed to enable kill switch: Command.*pfctl error msg",
         ):
             await connector.enable_kill_switch()
+
+
+@pytest.mark.asyncio
+async def test_kill_switch_monitor_enables_on_disconnect(connector):
+    """
+    The kill-switch monitor enables the kill switch once it sees a 'Disconnected'
+    status. The test waits for that call instead of sleeping.
+    """
+
+    enabled = asyncio.Event()
+    mock_enable = AsyncMock(side_effect=lambda: enabled.set())
+    with patch.object(connector, "status", AsyncMock(return_value="Disconnected")):
+        with patch.object(connector, "enable_kill_switch", mock_enable):
+            connector.start_kill_switch_monitor(interval=0.01)
+            await asyncio.wait_for(enabled.wait(), timeout=1)
+            await connector.stop_kill_switch_monitor()
+
+            mock_enable.assert_awaited_once()
@@ -23,34 +23,50 @@ from configuration.macos_l2tp_connection import (
 )
 from core.managers.vpn_manager_macos import MacOSL2TPConnector
 
+# Module whose subprocess helpers the connect() tests replace.
+_MACOS_MANAGER = "core.managers.vpn_manager_macos"
+
+
+def _patch_macos_helpers(monkeypatch, remote_ip: str) -> None:
+    """
+    Replaces the subprocess helpers connect() relies on with mocks that succeed,
+    reporting remote_ip as the address of the VPN server.
+    """
+    monkeypatch.setattr(
+        f"{_MACOS_MANAGER}.open_macos_network_settings", AsyncMock(return_value=None)
+    )
+    monkeypatch.setattr(
+        f"{_MACOS_MANAGER}.run_macos_command", AsyncMock(return_value=(b"", b""))
+    )
+    monkeypatch.setattr(
+        f"{_MACOS_MANAGER}.extract_ip_address_from_service_name",
+        AsyncMock(return_value=remote_ip),
+    )
+
 
 @pytest.mark.asyncio
-async def test_open_macos_network_settings_ok():
+async def test_open_macos_network_settings_ok(fake_subprocess):
     """
     If the subprocess returns code=0, we assume success.
     """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"", b"")
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        result = await open_macos_network_settings()
-        assert "Opened macOS Network Settings successfully." in result
+    fake_subprocess()
+
+    result = await open_macos_network_settings()
+    assert "Opened macOS Network Settings successfully." in result
 
 
 @pytest.mark.asyncio
-async def test_open_macos_network_settings_fail():
+async def test_open_macos_network_settings_fail(fake_subprocess):
     """
     Test the `open_macos_network_settings` function for a failure case.
 
     Simulates a subprocess call that returns a failure code (non-zero).
     Verifies that the function raises an exception with the appropriate error message.
     """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 1
-    mock_proc.communicate.return_value = (b"", b"some error")
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        with pytest.raises(Exception, match="Failed to open network settings:"):
-            await open_macos_network_settings()
+    fake_subprocess(1, b"", b"some error")
+
+    with pytest.raises(Exception, match="Failed to open network settings:"):
+        await open_macos_network_settings()
 
 
 def test_extract_ip_address_from_service_name_sync_ok(monkeypatch):
@@ -101,37 +117,33 @@ def test_extract_ip_address_from_service_name_sync_fail(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_extract_ip_address_from_service_name_ok():
+async def test_extract_ip_address_from_service_name_ok(fake_subprocess):
     """
     Test the asynchronous `extract_ip_address_from_service_name` function for a successful case.
 
     Simulates a subprocess call that returns typical `scutil --nc show` output containing
     a remote IP address. Verifies that the function extracts the remote IP address.
     """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"CommRemoteAddress : 2.2.2.2\n", b"")
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        ip = await extract_ip_address_from_service_name("MyL2TP")
-        assert ip == "2.2.2.2"
+    fake_subprocess(0, b"CommRemoteAddress : 2.2.2.2\n")
+
+    ip = await extract_ip_address_from_service_name("MyL2TP")
+    assert ip == "2.2.2.2"
 
 
 @pytest.mark.asyncio
-async def test_extract_ip_address_from_service_name_error():
+async def test_extract_ip_address_from_service_name_error(fake_subprocess):
     """
     Test the asynchronous `extract_ip_address_from_service_name` function for a failure case.
 
     Simulates a subprocess call that returns a non-zero exit code and an error message.
     Verifies that the function raises a `RuntimeError` with the appropriate error message.
     """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 2
-    mock_proc.communicate.return_value = (b"", b"some scutil error")
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        with pytest.raises(
-            RuntimeError, match="Failed to extract IP address: some scutil error"
-        ):
-            await extract_ip_address_from_service_name("FailVPN")
+    fake_subprocess(2, b"", b"some scutil error")
+
+    with pytest.raises(
+        RuntimeError, match="Failed to extract IP address: some scutil error"
+    ):
+        await extract_ip_address_from_service_name("FailVPN")
 
 
 @pytest.mark.asyncio
@@ -156,7 +168,7 @@ async def test_connect_with_kill_switch_sudo_fail():
 
 
 @pytest.mark.asyncio
-async def test_connect_with_kill_switch_ok():
+async def test_connect_with_kill_switch_ok(monkeypatch):
     """
     Test the `connect` method of `MacOSL2TPConnector` when the kill switch is enabled
     and the sudo password verification succeeds.
@@ -165,30 +177,19 @@ async def test_connect_with_kill_switch_ok():
     process completes successfully, returning a success message.
     """
     connector = MacOSL2TPConnector(service_name="MyL2TP")
+    mock_verify = MagicMock(return_value=None)
+    monkeypatch.setattr(connector, "_verify_sudo_password", mock_verify)
+    monkeypatch.setattr(connector, "status", AsyncMock(return_value="Connected"))
+    _patch_macos_helpers(monkeypatch, remote_ip="10.0.0.1")
 
-    with patch.object(
-        connector, "_verify_sudo_password", return_value=None
-    ) as mock_verify:
-        with patch(
-            "core.managers.vpn_manager_macos.open_macos_network_settings",
-            return_value=None,
-        ):
-            mock_run = AsyncMock()
-            mock_run.return_value = (b"", b"")  # stdout, stderr
-            with patch("core.managers.vpn_manager_macos.run_macos_command", mock_run):
-                with patch(
-                    "core.managers.vpn_manager_macos.extract_ip_address_from_service_name",
-                    return_value="10.0.0.1",
-                ):
-                    with patch.object(connector, "status", return_value="Connected"):
-                        result = await connector.connect(kill_switch_enabled=True)
-                        assert "Connected to 10.0.0.1" in result
-
-                        mock_verify.assert_called_once()
+    result = await connector.connect(kill_switch_enabled=True)
+    assert "Connected to 10.0.0.1" in result
+
+    mock_verify.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_connect_without_kill_switch_does_not_verify_sudo():
+async def test_connect_without_kill_switch_does_not_verify_sudo(monkeypatch):
     """
     Test the `connect` method of `MacOSL2TPConnector` when the kill switch is disabled.
 
@@ -196,20 +197,12 @@ async def test_connect_without_kill_switch_does_not_verify_sudo():
     process completes successfully, returning a success message.
     """
     connector = MacOSL2TPConnector(service_name="MyL2TP")
-    with patch.object(connector, "_verify_sudo_password") as mock_verify:
-        with patch(
-            "core.managers.vpn_manager_macos.open_macos_network_settings",
-            return_value=None,
-        ):
-            mock_run = AsyncMock()
-            mock_run.return_value = (b"", b"")
-            with patch("core.managers.vpn_manager_macos.run_macos_command", mock_run):
-                with patch(
-                    "core.managers.vpn_manager_macos.extract_ip_address_from_service_name",
-                    return_value="192.168.100.10",
-                ):
-                    with patch.object(connector, "status", return_value="Connected"):
-                        result = await connector.connect(kill_switch_enabled=False)
-                        assert "Connected to 192.168.100.10" in result
-
-                        mock_verify.assert_not_called()
+    mock_verify = MagicMock(return_value=None)
+    monkeypatch.setattr(connector, "_verify_sudo_password", mock_verify)
+    monkeypatch.setattr(connector, "status", AsyncMock(return_value="Connected"))
+    _patch_macos_helpers(monkeypatch, remote_ip="192.168.100.10")
+
+    result = await connector.connect(kill_switch_enabled=False)
+    assert "Connected to 192.168.100.10" in result
+
+    mock_verify.assert_not_called()
@@ -0,0 +1,617 @@
+"""
+Unit tests for WindowsL2TPConnector. rasdial/netsh calls are mocked out,
+so these tests run on any OS and only check the connector's behavior.
+"""
+
+import asyncio
+import ctypes
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from configuration.win_l2tp_connection import create_windows_l2tp
+from core.managers.vpn_manager_win import WindowsL2TPConnector
+
+
+def fake_rasdial(*lines):
+    """
+    Builds a stand-in for an asyncio rasdial process whose stdout yields the
+    given byte lines.
+    """
+    proc = MagicMock(returncode=None)
+
+    async def stdout():
+        for line in lines:
+            yield line
+
+    proc.stdout = stdout()
+    proc.wait = AsyncMock(return_value=0)
+    return proc
+
+
+@pytest.mark.asyncio
+async def test_connect_already_connected_same_ip():
+    """
+    If the connector is already connected to the requested server,
+    connect() returns immediately without spawning rasdial.
+    """
+    connector = WindowsL2TPConnector()
+    connector.is_connected = True
+    connector.established_server_ip = "1.2.3.4"
+
+    with patch.object(connector, "_run_command") as mock_run:
+        result = await connector.connect(server_ip="1.2.3.4")
+        assert "Already connected to 1.2.3.4" in result
+        mock_run.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enable_kill_switch_is_idempotent():
+    """
+    Enabling the kill switch twice must set the rules up only once
+    (one cleanup script plus one add script).
+    """
+    connector = WindowsL2TPConnector()
+    fake_completed = MagicMock(returncode=0, stdout=b"", stderr=b"")
+
+    with patch.object(
+        connector, "_run_command", return_value=fake_completed
+    ) as mock_run:
+        first = await connector.enable_kill_switch(server_ip="1.2.3.4")
+        second = await connector.enable_kill_switch(server_ip="1.2.3.4")
+
+        assert first == "Kill switch enabled successfully."
+        assert second == "Kill switch already enabled."
+        assert mock_run.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_enable_kill_switch_for_another_ip_replaces_rules():
+    """
+    Enabling the kill switch for a different server IP is not short-circuited:
+    the rules are removed and added again so KillSwitchAllowVPN follows the
+    new server.
+    """
+    connector = WindowsL2TPConnector()
+    scripts = []
+
+    async def fake_run(argv, capture=True, timeout=None):
+        with open(argv[2], encoding="utf-8") as script:
+            scripts.append(script.read())
+        return MagicMock(returncode=0, stdout=b"", stderr=b"")
+
+    with patch.object(connector, "_run_command", side_effect=fake_run):
+        await connector.enable_kill_switch(server_ip="1.2.3.4")
+        result = await connector.enable_kill_switch(server_ip="5.6.7.8")
+
+    assert result == "Kill switch enabled successfully."
+    assert len(scripts) == 4
+    assert "delete rule name=KillSwitchAllowVPN" in scripts[2]
+    assert "remoteip=5.6.7.8" in scripts[3]
+    assert connector._ks_ip == "5.6.7.8"
+
+
+@pytest.mark.asyncio
+async def test_disable_kill_switch_when_not_enabled():
+    """
+    Disabling a kill switch that was never enabled doesn't touch netsh.
+    """
+    connector = WindowsL2TPConnector()
+
+    with patch.object(connector, "_run_command") as mock_run:
+        result = await connector.disable_kill_switch()
+        assert result == "Kill switch already disabled."
+        mock_run.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_connect_retries_error_756_with_backoff():
+    """
+    On "Remote Access error 756" connect() resets the connection and retries
+    with the configured backoff until rasdial succeeds.
+    """
+    connector = WindowsL2TPConnector()
+    error_756 = MagicMock(returncode=1, stdout=b"Remote Access error 756", stderr=b"")
+    success = MagicMock(returncode=0, stdout=b"Command completed successfully.")
+
+    with patch.object(
+        connector, "_dial", side_effect=[error_756, error_756, success]
+    ) as mock_dial:
+        with patch.object(connector, "_reset_connection") as mock_reset:
+            with patch("core.managers.vpn_manager_win.asyncio.sleep") as mock_sleep:
+                result = await connector.connect()
+
+                assert "successfully" in result
+                assert mock_dial.call_count == 3
+                assert mock_reset.call_count == 2
+                assert [c.args[0] for c in mock_sleep.call_args_list] == [0.25, 0.5]
+
+
+@pytest.mark.asyncio
+async def test_connect_gives_up_after_four_tries_on_error_756():
+    """
+    A persistent "Remote Access error 756" is dialled at most four times
+    (the first attempt plus one retry per backoff delay) before connect() fails.
+    """
+    connector = WindowsL2TPConnector()
+    error_756 = MagicMock(returncode=1, stdout=b"Remote Access error 756", stderr=b"")
+
+    with patch.object(connector, "_dial", return_value=error_756) as mock_dial:
+        with patch.object(connector, "_reset_connection"):
+            with patch("core.managers.vpn_manager_win.asyncio.sleep"):
+                with pytest.raises(RuntimeError, match="rasdial failed"):
+                    await connector.connect()
+
+                assert mock_dial.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_connect_enables_kill_switch_once_after_rasdial():
+    """
+    With kill_switch_enabled=True the netsh rules are added exactly once,
+    and only after rasdial reported success.
+    """
+    connector = WindowsL2TPConnector()
+    calls = []
+    success = MagicMock(returncode=0, stdout=b"Command completed successfully.")
+
+    with patch.object(
+        connector, "_dial", side_effect=lambda *a: calls.append("dial") or success
+    ):
+        with patch.object(
+            connector,
+            "_apply_kill_switch",
+            side_effect=lambda ip: calls.append(("kill_switch", ip)),
+        ):
+            with patch("core.managers.vpn_manager_win.create_windows_l2tp"):
+                await connector.connect(server_ip="1.2.3.4", kill_switch_enabled=True)
+
+    assert calls == ["dial", ("kill_switch", "1.2.3.4")]
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_does_not_enable_kill_switch():
+    """
+    If rasdial fails, the kill switch must stay off and the connector
+    must not be marked as connected.
+    """
+    connector = WindowsL2TPConnector()
+    failure = MagicMock(returncode=1, stdout=b"Remote Access error 691", stderr=b"")
+
+    with patch.object(connector, "_dial", return_value=failure):
+        with patch.object(connector, "_apply_kill_switch") as mock_ks:
+            with patch("core.managers.vpn_manager_win.create_windows_l2tp"):
+                with pytest.raises(RuntimeError, match="rasdial failed"):
+                    await connector.connect(
+                        server_ip="1.2.3.4", kill_switch_enabled=True
+                    )
+            mock_ks.assert_not_called()
+
+    assert connector.is_connected is False
+    assert connector.established_server_ip is False
+
+
+@pytest.mark.asyncio
+async def test_status_reuses_recent_disconnected_check():
+    """
+    While disconnected, a second status() call right after the first
+    one is answered from cache without spawning rasdial again.
+    """
+    connector = WindowsL2TPConnector()
+
+    with patch(
+        "asyncio.create_subprocess_exec",
+        side_effect=lambda *a, **kw: fake_rasdial(b"No connections\r\n"),
+    ) as mock_exec:
+        assert await connector.status() == "Disconnected"
+        assert await connector.status() == "Disconnected"
+        assert mock_exec.call_count == 1
+
+
+async def watch_forever():
+    """
+    Stands in for _watch_connection_events: stays running until cancelled.
+    """
+    await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_status_reads_state_while_ras_watcher_runs():
+    """
+    status() never starts the RAS watcher itself; once connect() has started
+    it, status() answers from self.is_connected without spawning rasdial.
+    """
+    connector = WindowsL2TPConnector()
+
+    with patch.object(
+        connector, "_subscribe_connection_events", return_value=True
+    ) as mock_subscribe:
+        with patch.object(connector, "_watch_connection_events", new=watch_forever):
+            with patch(
+                "asyncio.create_subprocess_exec",
+                side_effect=lambda *a, **kw: fake_rasdial(b"No connections\r\n"),
+            ) as mock_exec:
+                assert await connector.status() == "Disconnected"
+                mock_subscribe.assert_not_called()
+                assert connector._conn_watch_task is None
+
+                connector._start_connection_watch()
+                connector.is_connected = True
+                connector.established_server_ip = "1.2.3.4"
+                assert "1.2.3.4" in await connector.status()
+                assert mock_exec.call_count == 1
+
+            with patch.object(connector, "_close_connection_events"):
+                await connector._stop_connection_watch()
+
+
+def test_ras_connection_active_enumerates_ras_connections():
+    """
+    _ras_connection_active() grows its buffer when RasEnumConnectionsW asks for
+    more room, then looks for the connector's entry among the connections.
+    """
+    connector = WindowsL2TPConnector(connection_name="MyL2TP")
+    calls = []
+
+    def fake_enum(conns, size, count):
+        calls.append(len(conns))
+        if len(conns) < 2:
+            size._obj.value = 2 * ctypes.sizeof(conns[0])
+            return WindowsL2TPConnector.ERROR_BUFFER_TOO_SMALL
+        conns[0].szEntryName = "Other VPN"
+        conns[1].szEntryName = "myl2tp"
+        count._obj.value = 2
+        return 0
+
+    windll = MagicMock()
+    windll.rasapi32.RasEnumConnectionsW.side_effect = fake_enum
+    with patch("ctypes.windll", windll, create=True):
+        assert connector._ras_connection_active() is True
+
+    assert calls[0] == 1 and calls[1] >= 2
+
+
+@pytest.mark.asyncio
+async def test_ras_watcher_stops_once_connection_drops():
+    """
+    When RAS signals an event and the entry is no longer enumerated, the
+    watcher marks the connector as disconnected, exits and closes its handles.
+    """
+    connector = WindowsL2TPConnector()
+    connector.is_connected = True
+    connector._conn_event, connector._conn_stop_event = 1, 2
+
+    windll = MagicMock()
+    windll.kernel32.WaitForMultipleObjects.return_value = (
+        WindowsL2TPConnector.WAIT_OBJECT_0
+    )
+    with patch("ctypes.windll", windll, create=True):
+        with patch.object(connector, "_ras_connection_active", return_value=False):
+            await asyncio.wait_for(connector._watch_connection_events(), timeout=1)
+
+    assert connector.is_connected is False
+    assert connector._conn_event is None and connector._conn_stop_event is None
+    assert windll.kernel32.CloseHandle.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_connect_starts_ras_watcher_and_disconnect_stops_it():
+    """
+    connect() starts the RAS watcher right away (not on the first status() call),
+    and disconnect() cancels it and closes the event handles.
+    """
+    connector = WindowsL2TPConnector()
+    success = MagicMock(returncode=0, stdout=b"Command completed successfully.")
+
+    with patch.object(connector, "_subscribe_connection_events", return_value=True):
+        with patch.object(connector, "_watch_connection_events", new=watch_forever):
+            with patch.object(connector, "_dial", return_value=success):
+                with patch.object(connector, "_run_command", return_value=success):
+                    with patch.object(
+                        connector, "_close_connection_events"
+                    ) as mock_close:
+                        await connector.connect()
+                        watcher = connector._conn_watch_task
+                        assert watcher is not None and not watcher.done()
+                        assert connector._status_task is None
+
+                        await connector.disconnect()
+                        assert watcher.cancelled()
+                        assert connector._conn_watch_task is None
+                        mock_close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_kill_switch_rules_are_applied_by_one_netsh_script():
+    """
+    Both kill switch rules go through a single `netsh -f` script, and a
+    failing script is rolled back and reported.
+    """
+    connector = WindowsL2TPConnector()
+    scripts = []
+
+    async def fake_run(argv, capture=True, timeout=None):
+        assert argv[:2] == ("netsh", "-f")
+        with open(argv[2], encoding="utf-8") as script:
+            scripts.append(script.read().splitlines())
+        returncode = 1 if "add rule" in scripts[-1][0] else 0
+        return MagicMock(returncode=returncode, stdout=b"", stderr=b"boom")
+
+    with patch.object(connector, "_run_command", side_effect=fake_run):
+        with pytest.raises(RuntimeError, match="boom"):
+            await connector.enable_kill_switch(server_ip="1.2.3.4")
+
+    cleanup_script, add_script, rollback_script = scripts
+    assert cleanup_script == rollback_script
+    assert "name=KillSwitchBlockAll" in add_script[0]
+    assert "remoteip=1.2.3.4" in add_script[1]
+    assert add_script[-1] == "exit"
+    assert all("delete rule" in line for line in rollback_script[:-1])
+    assert connector._ks_state is False
+
+
+@pytest.mark.asyncio
+async def test_failed_kill_switch_removal_keeps_it_enabled():
+    """
+    If netsh fails to delete the kill switch rules, disable_kill_switch()
+    reports the error and the kill switch stays marked as enabled.
+    """
+    connector = WindowsL2TPConnector()
+    connector._ks_state = True
+    connector._ks_ip = "1.2.3.4"
+    failed = MagicMock(returncode=1, stdout=b"", stderr=b"access denied")
+
+    with patch.object(connector, "_run_command", return_value=failed):
+        with pytest.raises(RuntimeError, match="access denied"):
+            await connector.disable_kill_switch()
+
+    assert connector._ks_state is True
+    assert connector._ks_ip == "1.2.3.4"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_when_not_connected_is_noop():
+    """
+    disconnect() on a connector that isn't connected returns right away
+    without spawning rasdial or netsh.
+    """
+    connector = WindowsL2TPConnector()
+
+    with patch.object(connector, "_run_command") as mock_run:
+        assert await connector.disconnect() == "Already disconnected."
+        mock_run.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_when_already_dropped_stops_ras_watcher():
+    """
+    A connector whose tunnel already dropped still has its RAS watcher stopped
+    by disconnect(), even though no rasdial is needed.
+    """
+    connector = WindowsL2TPConnector()
+
+    with patch.object(connector, "_subscribe_connection_events", return_value=True):
+        with patch.object(connector, "_watch_connection_events", new=watch_forever):
+            connector._start_connection_watch()
+            watcher = connector._conn_watch_task
+
+            with patch.object(connector, "_run_command") as mock_run:
+                with patch.object(connector, "_close_connection_events"):
+                    assert await connector.disconnect() == "Already disconnected."
+                    mock_run.assert_not_called()
+
+    assert watcher.cancelled()
+    assert connector._conn_watch_task is None
+
+
+@pytest.mark.asyncio
+async def test_disconnect_after_drop_removes_kill_switch():
+    """
+    If the tunnel dropped on its own (is_connected already False), disconnect()
+    skips rasdial but still removes the kill switch rules, so the user isn't
+    left locked out.
+    """
+    connector = WindowsL2TPConnector()
+    connector._ks_state = True
+    connector._ks_ip = "1.2.3.4"
+    scripts = []
+
+    async def fake_run(argv, capture=True, timeout=None):
+        assert argv[:2] == ("netsh", "-f")
+        with open(argv[2], encoding="utf-8") as script:
+            scripts.append(script.read())
+        return MagicMock(returncode=0, stdout=b"", stderr=b"")
+
+    with patch.object(connector, "_run_command", side_effect=fake_run):
+        assert await connector.disconnect() == "Already disconnected."
+
+    assert len(scripts) == 1
+    assert "delete rule name=KillSwitchBlockAll" in scripts[0]
+    assert connector._ks_state is False
+
+
+@pytest.mark.asyncio
+async def test_disconnect_waits_for_in_flight_connect():
+    """
+    A disconnect() issued while connect() is still dialling waits for it and
+    then tears the new connection down, instead of reporting "Already
+    disconnected." and leaving the tunnel up.
+    """
+    connector = WindowsL2TPConnector()
+    success = MagicMock(returncode=0, stdout=b"Command completed successfully.")
+    dialling = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_dial(*args):
+        dialling.set()
+        await release.wait()
+        return success
+
+    with patch.object(connector, "_dial", side_effect=slow_dial):
+        with patch.object(connector, "_run_command", return_value=success) as mock_run:
+            connect_task = asyncio.create_task(connector.connect())
+            await dialling.wait()
+
+            disconnect_task = asyncio.create_task(connector.disconnect())
+            await asyncio.sleep(0)
+            release.set()
+
+            await connect_task
+            assert "successfully" in await disconnect_task
+            mock_run.assert_called_once()
+            assert connector.is_connected is False
+
+
+@pytest.mark.asyncio
+async def test_disconnect_removes_kill_switch_only_if_enabled():
+    """
+    After a successful rasdial /disconnect the kill switch rules are removed,
+    but only when they were enabled in the first place.
+    """
+    connector = WindowsL2TPConnector()
+    fake_completed = MagicMock(returncode=0, stdout=b"", stderr=b"")
+
+    with patch.object(connector, "_run_command", return_value=fake_completed):
+        with patch.object(connector, "_remove_kill_switch") as mock_disable:
+            connector.is_connected = True
+            await connector.disconnect()
+            mock_disable.assert_not_called()
+
+            connector.is_connected = True
+            connector._ks_state = True
+            await connector.disconnect()
+            mock_disable.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_run_command_returns_raw_bytes():
+    """
+    _run_command runs the process natively on the event loop and hands back
+    its exit code and undecoded output.
+    """
+    connector = WindowsL2TPConnector()
+
+    result = await connector._run_command(
+        (sys.executable, "-c", "import sys; print('ok'); sys.exit(3)")
+    )
+
+    assert result.returncode == 3
+    assert result.stdout.strip() == b"ok"
+
+
+@pytest.mark.asyncio
+async def test_resolve_hostname_is_cached():
+    """
+    A hostname is looked up once; later resolutions come from the cache
+    and IP literals never hit DNS at all.
+    """
+    connector = WindowsL2TPConnector()
+    infos = [(2, 1, 6, "", ("5.6.7.8", 0))]
+
+    with patch(
+        "asyncio.BaseEventLoop.getaddrinfo", new=AsyncMock(return_value=infos)
+    ) as mock_getaddrinfo:
+        assert await connector._resolve_hostname_async("vpn.example") == "5.6.7.8"
+        assert await connector._resolve_hostname_async("vpn.example") == "5.6.7.8"
+        assert await connector._resolve_hostname_async("1.2.3.4") == "1.2.3.4"
+        assert mock_getaddrinfo.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_hostname_cache_expires():
+    """
+    A cached hostname older than DNS_CACHE_TTL is looked up again.
+    """
+    connector = WindowsL2TPConnector()
+    infos = [(2, 1, 6, "", ("5.6.7.8", 0))]
+
+    with patch(
+        "asyncio.BaseEventLoop.getaddrinfo", new=AsyncMock(return_value=infos)
+    ) as mock_getaddrinfo:
+        await connector._resolve_hostname_async("vpn.example")
+        resolved_at, ip = connector._resolved_hosts["vpn.example"]
+        connector._resolved_hosts["vpn.example"] = (
+            resolved_at - connector.DNS_CACHE_TTL,
+            ip,
+        )
+
+        assert await connector._resolve_hostname_async("vpn.example") == "5.6.7.8"
+        assert mock_getaddrinfo.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_status_served_by_background_refresher_while_connected():
+    """
+    After a successful connect() the status is answered from the state kept
+    by the background refresher, and disconnect() stops that refresher.
+    """
+    connector = WindowsL2TPConnector()
+    success = MagicMock(returncode=0, stdout=b"Command completed successfully.")
+
+    with patch.object(connector, "_dial", return_value=success):
+        with patch.object(connector, "_run_command", return_value=success):
+            with patch("asyncio.create_subprocess_exec") as mock_exec:
+                await connector.connect()
+                refresher = connector._status_task
+                assert refresher is not None
+
+                assert "successfully" in await connector.status()
+                mock_exec.assert_not_called()
+
+            await connector.disconnect()
+            assert connector._status_task is None
+            await asyncio.sleep(0)
+            assert refresher.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_status_check_stops_reading_at_success_line():
+    """
+    The rasdial status output is streamed: the connection is reported as up
+    once the profile name and the success line are seen, and the rest of the
+    output isn't read.
+    """
+    connector = WindowsL2TPConnector()
+    connector.established_server_ip = "1.2.3.4"
+    proc = fake_rasdial(
+        b"Connected to\r\n",
+        b"MyL2TP\r\n",
+        b"Command completed successfully.\r\n",
+        b"trailing output\r\n",
+    )
+
+    with patch("asyncio.create_subprocess_exec", return_value=proc):
+        result = await connector._status_check()
+
+    assert "1.2.3.4" in result
+    proc.kill.assert_called_once()
+    proc.wait.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_run_command_kills_process_on_timeout():
+    """
+    A command that outlives its timeout is killed and reported as an error
+    instead of blocking the caller.
+    """
+    connector = WindowsL2TPConnector()
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        await connector._run_command(
+            (sys.executable, "-c", "import time; time.sleep(30)"), timeout=0.2
+        )
+
+
+def test_create_windows_l2tp_reports_powershell_timeout_as_runtime_error():
+    """
+    A PowerShell script that hangs past POWERSHELL_TIMEOUT surfaces as the
+    RuntimeError that create_windows_l2tp documents, not as TimeoutExpired.
+    """
+    timeout = subprocess.TimeoutExpired(cmd="powershell", timeout=60)
+    with patch("configuration.win_l2tp_connection.subprocess.run", side_effect=timeout):
+        with pytest.raises(RuntimeError, match="timed out") as exc_info:
+            create_windows_l2tp("1.2.3.4", "MyL2TP")
+
+    assert exc_info.value.__cause__.__cause__ is timeout
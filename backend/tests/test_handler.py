@@ -1,17 +1,17 @@
 # tests/test_handler.py
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fastapi.testclient import TestClient
+from fastapi import HTTPException
 
 from core.services.handler import VPNGateHandler
 from core.services.packer import Packer
 from core.services.parser import Parser
-from main import app  # Make sure 'app' is your FastAPI instance
+from utils.reusable.sort_directions import SortDirection
 
 
-def test_vpn_servers_list_endpoint():
+def test_vpn_servers_list_endpoint(api_client):
     """
     Integration test that checks if the /api/v1/vpn_servers_list endpoint
     correctly processes query parameters (e.g., search=66, sort_by=Ping)
@@ -25,8 +25,7 @@ def test_vpn_servers_list_endpoint():
     Returns:
         None. Asserts the endpoint is reachable and responds with 200.
     """
-    client = TestClient(app)
-    resp = client.get("/api/v1/vpn_servers_list?search=66&sort_by=Ping")
+    resp = api_client.get("/api/v1/vpn_servers_list?search=66&sort_by=Ping")
     assert resp.status_code == 200
 
     data = resp.json()
@@ -82,34 +81,160 @@ def test_vpngate_handler_get_vpn_servers(mocked_parser):
 
 
 @patch(
-    "core.services.handler.Packer.transform_content",
+    "core.services.handler.Packer.parsed_rows",
     side_effect=Exception("Some error"),
 )
-def test_vpngate_handler_get_vpn_servers_exception(mock_transform):
+def test_vpngate_handler_get_vpn_servers_exception(mock_parsed_rows):
     """
-    Test that get_vpn_servers() handles exceptions thrown by the packer
-    and returns a dictionary with the error message.
+    Test that get_vpn_servers() turns exceptions thrown by the packer
+    into an HTTPException with a 502 status and the error message.
 
     Steps:
-    1. Patch Packer.transform_content to raise an Exception("Some error").
+    1. Patch Packer.parsed_rows to raise an Exception("Some error").
     2. Create a VPNGateHandler with any dummy Parser/Packer (not used).
     3. Call handler.get_vpn_servers().
-    4. Expect the returned value to be a dict with
-       {\"You've got an error in getting vpn server list method, \": "Some error"}.
+    4. Expect an HTTPException with status_code 502 whose detail
+       contains "Some error".
 
     Args:
-        mock_transform (MagicMock): A mock that replaces transform_content with
+        mock_parsed_rows (MagicMock): A mock that replaces parsed_rows with
             side_effect=Exception("Some error").
 
     Returns:
-        None. Asserts that the result is a dict containing "Some error".
+        None. Asserts that the raised HTTPException carries "Some error".
     """
     parser = Parser("fakeurl")
     packer = Packer("not_important")
     handler = VPNGateHandler(parser=parser, packer=packer)
 
-    result = handler.get_vpn_servers()
-    assert isinstance(result, dict), "Expected a dict with error info."
-    assert (
-        "Some error" in list(result.values())[0]
-    ), "Error message not found in result."
+    with pytest.raises(HTTPException) as exc_info:
+        handler.get_vpn_servers()
+    assert exc_info.value.status_code == 502
+    assert "Some error" in exc_info.value.detail, "Error message not found in detail."
+
+
+def test_vpngate_handler_get_vpn_servers_uses_cache(mocked_parser):
+    """
+    Test that repeated get_vpn_servers() calls don't re-parse the CSV, and that
+    a stale cache is still served without a blocking refetch.
+
+    Steps:
+    1. Build a handler from 'mocked_parser' and spy on Packer.parsed_rows.
+    2. Call get_vpn_servers() twice with different queries.
+    3. Assert the CSV was parsed only once.
+    4. Age the cache past the TTL and call again.
+    5. Assert nothing was refetched or re-parsed (that's refresh_if_stale's job).
+
+    Args:
+        mocked_parser (Parser): A pytest fixture that has parseURL()
+            returning a small CSV sample.
+
+    Returns:
+        None. Asserts how many times the CSV was parsed.
+    """
+    packer = Packer(mocked_parser.parseURL())
+    handler = VPNGateHandler(parser=mocked_parser, packer=packer)
+
+    with patch.object(
+        packer, "parsed_rows", wraps=packer.parsed_rows
+    ) as mock_parsed_rows:
+        assert len(handler.get_vpn_servers()) == 4
+        assert len(handler.get_vpn_servers(search="66", sort_by="Ping")) == 1
+        assert mock_parsed_rows.call_count == 1
+
+        timestamp, servers = handler._raw_cache
+        handler._raw_cache = (timestamp - handler.SERVERS_CACHE_TTL, servers)
+
+        with patch.object(mocked_parser, "parseURL") as mock_parse_url:
+            assert len(handler.get_vpn_servers()) == 4
+            mock_parse_url.assert_not_called()
+        assert mock_parsed_rows.call_count == 1
+
+
+def test_vpngate_handler_query_cache_is_bounded(sample_csv):
+    """
+    Test that cached query results are capped at QUERY_CACHE_SIZE entries,
+    dropping the least recently used query first.
+
+    Args:
+        sample_csv (str): The sample CSV data.
+
+    Returns:
+        None. Asserts the cache size and which queries survive.
+    """
+    handler = VPNGateHandler(parser=Parser("fakeurl"), packer=Packer(sample_csv))
+    handler.get_vpn_servers(search="first")
+    handler.get_vpn_servers(search="second")
+
+    for i in range(handler.QUERY_CACHE_SIZE - 2):
+        handler.get_vpn_servers(search=f"query-{i}")
+    # Touch the oldest entry, so "second" becomes the least recently used one.
+    handler.get_vpn_servers(search="first")
+    handler.get_vpn_servers(search="one-more")
+
+    assert len(handler._cache) == handler.QUERY_CACHE_SIZE
+    assert ("first", None, SortDirection.ASC) in handler._cache
+    assert ("second", None, SortDirection.ASC) not in handler._cache
+
+
+@pytest.mark.asyncio
+async def test_vpngate_handler_refresh_keeps_list_on_failed_fetch(sample_csv):
+    """
+    Test that a failed refetch of a stale list keeps serving that list, and
+    that the next refresh tries again.
+
+    Args:
+        sample_csv (str): The sample CSV data.
+
+    Returns:
+        None. Asserts the list survives the failure and is replaced afterwards.
+    """
+    parser = Parser("fakeurl")
+    handler = VPNGateHandler(parser=parser, packer=Packer(sample_csv))
+    assert len(handler.get_vpn_servers()) == 4
+
+    timestamp, servers = handler._raw_cache
+    handler._raw_cache = (timestamp - handler.SERVERS_CACHE_TTL, servers)
+
+    with patch.object(
+        parser,
+        "parse_url_lines",
+        new=AsyncMock(side_effect=[None, sample_csv.splitlines()]),
+    ) as mock_parse:
+        await handler.refresh_if_stale()
+        assert handler._raw_cache[1] is servers
+        assert len(handler.get_vpn_servers()) == 4
+
+        await handler.refresh_if_stale()
+        assert mock_parse.await_count == 2
+        assert handler._raw_cache is None
+        assert len(handler.get_vpn_servers()) == 4
+
+
+def test_vpngate_handler_failed_fetch_is_not_cached(sample_csv):
+    """
+    Test that content the parser failed to fetch (None) is reported as a 502
+    instead of being cached as an empty server list.
+
+    Steps:
+    1. Build a handler whose packer holds no content, as after a failed fetch.
+    2. Expect get_vpn_servers() to raise an HTTPException with status_code 502.
+    3. Assert nothing was cached.
+    4. Give the packer valid content and assert the servers are returned.
+
+    Args:
+        sample_csv (str): The sample CSV data.
+
+    Returns:
+        None. Asserts the failure isn't cached and a later parse succeeds.
+    """
+    packer = Packer(None)
+    handler = VPNGateHandler(parser=Parser("fakeurl"), packer=packer)
+
+    with pytest.raises(HTTPException) as exc_info:
+        handler.get_vpn_servers()
+    assert exc_info.value.status_code == 502
+    assert handler._raw_cache is None
+
+    packer.content = sample_csv
+    assert len(handler.get_vpn_servers()) == 4
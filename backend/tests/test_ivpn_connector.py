@@ -11,6 +11,16 @@ import pytest
 
 from core.interfaces.ivpn_connector import IVpnConnector
 
+REQUIRED_METHODS = frozenset(
+    {
+        "connect",
+        "disconnect",
+        "status",
+        "enable_kill_switch",
+        "disable_kill_switch",
+    }
+)
+
 
 def test_ivpn_connector_protocol_shape():
     """
@@ -20,14 +30,5 @@ def test_ivpn_connector_protocol_shape():
     This is a simple example – often there's no direct 'runtime test'
     for a Protocol, as it's mostly checked by static typing (mypy).
     """
-    required_methods = [
-        "connect",
-        "disconnect",
-        "status",
-        "enable_kill_switch",
-        "disable_kill_switch",
-    ]
-    for method_name in required_methods:
-        assert hasattr(
-            IVpnConnector, method_name
-        ), f"IVpnConnector is missing method: {method_name}"
+    missing = REQUIRED_METHODS - set(dir(IVpnConnector))
+    assert not missing, f"IVpnConnector is missing methods: {sorted(missing)}"
@@ -12,7 +12,6 @@ to avoid actually running them, or we can test them for presence.
 
 import asyncio
 import subprocess
-from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -25,65 +24,49 @@ from scripts.bash.mac.kill_switch import (
 
 
 @pytest.mark.asyncio
-async def test_enable_kill_switch_ok():
-    """
-    Tests enable_kill_switch() with a mocked subprocess call returning success.
-    We expect no exception if returncode=0.
-    """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"Kill-switch enabled", b"")
-
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        output = await enable_kill_switch()
-        assert "Kill-switch enabled" in output
-
-
-@pytest.mark.asyncio
-async def test_enable_kill_switch_fail():
-    """
-    Tests enable_kill_switch() raising RuntimeError if script fails.
-    """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 1
-    mock_proc.communicate.return_value = (b"", b"some error")
-
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        with pytest.raises(
-            RuntimeError, match="Failed to enable kill switch. Stderr: some error"
-        ):
-            await enable_kill_switch()
-
-
-@pytest.mark.asyncio
-async def test_disable_kill_switch_ok():
+@pytest.mark.parametrize(
+    "toggle, stdout, expected",
+    [
+        (enable_kill_switch, b"Kill-switch enabled", "Kill-switch enabled"),
+        (disable_kill_switch, b"Kill-switch disabled", "Kill-switch disabled"),
+    ],
+)
+async def test_kill_switch_script_ok(fake_subprocess, toggle, stdout, expected):
     """
-    Tests disable_kill_switch() success scenario.
+    Tests enable_kill_switch() and disable_kill_switch() with a mocked subprocess
+    call returning success. We expect the script output back if returncode=0.
     """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 0
-    mock_proc.communicate.return_value = (b"Kill-switch disabled", b"")
+    fake_subprocess(0, stdout)
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        output = await disable_kill_switch()
-        assert "Kill-switch disabled" in output
+    output = await toggle()
+    assert expected in output
 
 
 @pytest.mark.asyncio
-async def test_disable_kill_switch_fail():
+@pytest.mark.parametrize(
+    "toggle, stderr, message",
+    [
+        (
+            enable_kill_switch,
+            b"some error",
+            "Failed to enable kill switch. Stderr: some error",
+        ),
+        (
+            disable_kill_switch,
+            b"some disable error",
+            "Failed to disable kill switch. Stderr: some disable error",
+        ),
+    ],
+)
+async def test_kill_switch_script_fail(fake_subprocess, toggle, stderr, message):
     """
-    Tests disable_kill_switch() raising RuntimeError if script fails.
+    Tests enable_kill_switch() and disable_kill_switch() raising RuntimeError
+    if the script fails.
     """
-    mock_proc = AsyncMock()
-    mock_proc.returncode = 1
-    mock_proc.communicate.return_value = (b"", b"some disable error")
+    fake_subprocess(1, b"", stderr)
 
-    with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-        with pytest.raises(
-            RuntimeError,
-            match="Failed to disable kill switch. Stderr: some disable error",
-        ):
-            await disable_kill_switch()
+    with pytest.raises(RuntimeError, match=message):
+        await toggle()
 
 
 def test_scripts_names_enum():
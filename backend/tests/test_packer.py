@@ -1,5 +1,6 @@
 # tests/test_packer.py
 
+import csv
 from unittest.mock import patch
 
 import pytest
@@ -31,6 +32,51 @@ def test_packer_transform_content_basic(sample_packer):
     assert len(data) == 4
 
 
+def test_packer_transform_content_quoted_field():
+    """
+    Test that transform_content() keeps a quoted CSV field containing a comma
+    as a single value instead of splitting it across columns.
+
+    Returns:
+        None. Asserts that the quoted 'Message' survives intact and the
+        following column is still aligned.
+    """
+    content = (
+        "*vpn_servers\n"
+        "#HostName,IP,Message,CountryShort\n"
+        'public-vpn-1,1.2.3.4,"hello, world",JP\n'
+        "*\n"
+    )
+    data = Packer(content).transform_content()
+    assert data == [
+        {
+            "#HostName": "public-vpn-1",
+            "IP": "1.2.3.4",
+            "Message": "hello, world",
+            "CountryShort": "JP",
+        }
+    ]
+
+
+def test_packer_transform_content_parses_once(sample_packer):
+    """
+    Test that the CSV is parsed on the first transform_content() call only,
+    and that the raw content is released afterwards.
+
+    Args:
+        sample_packer (Packer): The Packer instance with CSV data.
+
+    Returns:
+        None. Asserts csv.reader runs once across several queries.
+    """
+    with patch("core.services.packer.csv.reader", wraps=csv.reader) as mock_reader:
+        assert len(sample_packer.transform_content()) == 4
+        assert len(sample_packer.transform_content(search="66")) == 1
+        assert mock_reader.call_count == 1
+
+    assert sample_packer.content is None
+
+
 def test_packer_transform_content_with_search(sample_packer):
     """
     Test that transform_content() can filter by partial hostname
@@ -170,29 +216,48 @@ def test_packer_transform_content_empty(empty_packer):
     assert data == []
 
 
-@patch("core.services.packer.traceback")
-def test_packer_transform_content_exception(mock_tb, sample_packer):
+def test_packer_parsed_rows_raises_without_content(empty_packer):
+    """
+    Test that parsed_rows() raises instead of returning [] when there is
+    nothing to parse, so callers can tell a failed fetch from an empty list.
+
+    Args:
+        empty_packer (Packer): A fixture with no CSV data at all.
+
+    Returns:
+        None. Asserts ValueError for empty and for missing content.
+    """
+    with pytest.raises(ValueError, match="no header row"):
+        empty_packer.parsed_rows()
+
+    with pytest.raises(ValueError, match="No CSV content"):
+        Packer(None).parsed_rows()
+
+
+@patch("core.services.packer.logger")
+def test_packer_transform_content_exception(mock_logger, sample_packer):
     """
     Test the exception block in transform_content() by invalidating self.content.
 
-    We set sample_packer.content = None, which triggers an AttributeError
-    on split(). We verify that the method returns [] and calls traceback.print_exc().
+    We set sample_packer.content = None, which also drops the cached rows, so
+    _parse_rows() raises ValueError("No CSV content to parse"). We verify that
+    the method returns [] and logs the exception.
 
     Args:
-        mock_tb (MagicMock): Mocked version of the 'traceback' module.
+        mock_logger (MagicMock): Mocked module logger.
         sample_packer (Packer): The Packer instance with normal CSV data.
 
     Returns:
-        None. Asserts an empty list is returned and traceback is printed.
+        None. Asserts an empty list is returned and the exception is logged.
     """
     sample_packer.content = None
     data = sample_packer.transform_content()
     assert data == []
-    mock_tb.print_exc.assert_called_once()
+    mock_logger.exception.assert_called_once()
 
 
-@patch("core.services.packer.traceback")
-def test_packer_sort_content_exception(mock_tb, sample_packer):
+@patch("core.services.packer.logger")
+def test_packer_sort_content_exception(mock_logger, sample_packer):
     """
     Test the exception block in sort_content() by patching it to raise an Exception.
 
@@ -200,42 +265,42 @@ def test_packer_sort_content_exception(mock_tb, sample_packer):
     Then transform_content() should catch that exception and return [].
 
     Args:
-        mock_tb (MagicMock): Mock for traceback.
+        mock_logger (MagicMock): Mocked module logger.
         sample_packer (Packer): A normal Packer instance.
 
     Returns:
-        None. Asserts that transform_content() returns [] and traceback is printed.
+        None. Asserts that transform_content() returns [] and the exception is logged.
     """
     with patch.object(
         sample_packer, "sort_content", side_effect=Exception("Sort fail")
     ):
         data = sample_packer.transform_content(sort_by="Ping")
         assert data == []
-    mock_tb.print_exc.assert_called_once()
+    mock_logger.exception.assert_called_once()
 
 
-@patch("core.services.packer.traceback")
-def test_packer_filter_by_hostname_exception(mock_tb, sample_packer):
+@patch("core.services.packer.logger")
+def test_packer_filter_by_hostname_exception(mock_logger, sample_packer):
     """
     Test the exception block in filter_by_hostname() by passing None instead of a data list.
 
     This forces row.get(...) calls on None, raising an exception,
-    which should be caught, resulting in an empty list and a printed traceback.
+    which should be caught, resulting in an empty list and a logged exception.
 
     Args:
-        mock_tb (MagicMock): Mocked traceback.
+        mock_logger (MagicMock): Mocked module logger.
         sample_packer (Packer): A normal Packer instance.
 
     Returns:
-        None. Asserts that filter_by_hostname(...) returns [] and calls print_exc().
+        None. Asserts that filter_by_hostname(...) returns [] and logs the exception.
     """
     result = sample_packer.filter_by_hostname(None, "66")
     assert result == []
-    mock_tb.print_exc.assert_called_once()
+    mock_logger.exception.assert_called_once()
 
 
-@patch("core.services.packer.traceback")
-def test_packer_remove_restricted_countries_exception(mock_tb, sample_packer):
+@patch("core.services.packer.logger")
+def test_packer_remove_restricted_countries_exception(mock_logger, sample_packer):
     """
     Test the exception block in remove_restricted_countries() by passing None.
 
@@ -243,21 +308,21 @@ def test_packer_remove_restricted_countries_exception(mock_tb, sample_packer):
     triggering an exception. The method should catch it and return [].
 
     Args:
-        mock_tb (MagicMock): Mocked traceback.
+        mock_logger (MagicMock): Mocked module logger.
         sample_packer (Packer): The Packer instance.
 
     Returns:
         None. Asserts that remove_restricted_countries(...) returns []
-        and calls print_exc().
+        and logs the exception.
     """
     result = sample_packer.remove_restricted_countries(None)
     assert result == []
-    mock_tb.print_exc.assert_called_once()
+    mock_logger.exception.assert_called_once()
 
 
 def test_packer_format_content(sample_packer):
     """
-    Test that format_content() returns a well-formatted string representation (using pformat).
+    Test that format_content() returns a well-formatted string representation (indented JSON).
 
     We first obtain a list of rows by transform_content(), then call format_content()
     to produce a pretty-printed string. We expect the string to contain known
@@ -275,3 +340,19 @@ def test_packer_format_content(sample_packer):
     text_repr = sample_packer.format_content(data)
     assert isinstance(text_repr, str)
     assert "HostName" in text_repr or "#HostName" in text_repr
+
+
+def test_packer_transform_content_from_lines(sample_csv):
+    """
+    Test that a Packer built from already split lines (as streamed by the
+    parser) gives the same rows as one built from the whole CSV string.
+
+    Args:
+        sample_csv (str): The sample CSV data.
+
+    Returns:
+        None. Asserts both inputs produce identical rows.
+    """
+    from_lines = Packer(sample_csv.splitlines()).transform_content()
+    assert from_lines == Packer(sample_csv).transform_content()
+    assert len(from_lines) == 4
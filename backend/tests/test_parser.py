@@ -1,8 +1,9 @@
 # tests/test_parser.py
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import core.services.parser as parser_module
 from core.services.parser import Parser
 from utils.reusable.vars import request_url
 
@@ -19,14 +20,14 @@ def test_parser_parseURL_ok(mock_request):
 
     Assertions:
     - The result of `parseURL` matches the mocked response text.
-    - The `request` method is called exactly once with the correct arguments.
+    - `request` is called exactly once with the correct arguments.
     """
     mock_request.return_value.text = "MOCK_RESPONSE"
     parser = Parser(request_url)
 
     result = parser.parseURL()
     assert result == "MOCK_RESPONSE"
-    mock_request.assert_called_once_with("GET", request_url)
+    mock_request.assert_called_once_with("GET", request_url, timeout=30.0)
 
 
 @patch("core.services.parser.request", side_effect=Exception("Network error"))
@@ -40,9 +41,75 @@ def test_parser_parseURL_exception(mock_request):
 
     Assertions:
     - The result of `parseURL` is `None` when an exception is raised.
-    - The `request` method is called exactly once with the correct arguments.
+    - `request` is called exactly once with the correct arguments.
     """
     parser = Parser(request_url)
     result = parser.parseURL()
     assert result is None
-    mock_request.assert_called_once_with("GET", request_url)
+    mock_request.assert_called_once_with("GET", request_url, timeout=30.0)
+
+
+@pytest.mark.asyncio
+@patch("core.services.parser._get_async_client")
+async def test_parser_parse_url_lines_ok(mock_get_client):
+    """
+    Test that the streamed response body is returned line by line.
+
+    Assertions:
+    - The result of `parse_url_lines` is the list of streamed lines.
+    - The client's `stream` is called once with a GET on the parser URL.
+    """
+
+    async def aiter_lines():
+        for line in ("*vpn_servers", "#HostName,IP"):
+            yield line
+
+    mock_client = mock_get_client.return_value
+    response = mock_client.stream.return_value.__aenter__.return_value
+    # raise_for_status() is synchronous on httpx responses.
+    response.raise_for_status = MagicMock()
+    response.aiter_lines = aiter_lines
+    parser = Parser(request_url)
+
+    result = await parser.parse_url_lines()
+    assert result == ["*vpn_servers", "#HostName,IP"]
+    mock_client.stream.assert_called_once_with("GET", request_url)
+
+
+@pytest.mark.asyncio
+@patch("core.services.parser.logger")
+@patch("core.services.parser._get_async_client")
+async def test_parser_parse_url_lines_exception(mock_get_client, mock_logger):
+    """
+    Test handling of exceptions while streaming the response.
+
+    Assertions:
+    - The result of `parse_url_lines` is `None` when the request raises.
+    - The failure is logged through the module logger.
+    """
+    mock_get_client.return_value.stream.side_effect = Exception("Network error")
+    parser = Parser(request_url)
+
+    result = await parser.parse_url_lines()
+    assert result is None
+    mock_logger.exception.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_close_async_client():
+    """
+    Test that the shared async client is closed and dropped on shutdown.
+
+    Assertions:
+    - The client returned before close_async_client() is closed afterwards.
+    - The next _get_async_client() call creates a fresh client.
+    """
+    client = parser_module._get_async_client()
+
+    await parser_module.close_async_client()
+    assert client.is_closed
+    assert parser_module._async_client is None
+
+    fresh = parser_module._get_async_client()
+    assert fresh is not client
+    await parser_module.close_async_client()
@@ -0,0 +1,144 @@
+"""
+Unit tests for get_vpngate_handler in dependencies/vpn_handler_fabric.py.
+We mock Parser.parse_url_lines() so no request goes to vpngate.net, and check that
+all callers share a single handler.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import dependencies.vpn_handler_fabric as vpn_handler_fabric
+from core.services.handler import VPNGateHandler
+from dependencies.vpn_handler_fabric import get_vpngate_handler
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_handler():
+    """
+    Drops the shared handler and its refresh task before and after each test.
+    """
+    vpn_handler_fabric._shared_handler = None
+    vpn_handler_fabric._refresh_task = None
+    yield
+    vpn_handler_fabric._shared_handler = None
+    vpn_handler_fabric._refresh_task = None
+
+
+@pytest.mark.asyncio
+async def test_get_vpngate_handler_is_shared(sample_csv):
+    """
+    Repeated calls return the same handler, and the CSV is fetched only once
+    while the handler's cache is fresh.
+    """
+    with patch(
+        "core.services.parser.Parser.parse_url_lines",
+        return_value=sample_csv.splitlines(),
+    ) as mock_parse:
+        first = await get_vpngate_handler()
+        first.get_vpn_servers()
+        second = await get_vpngate_handler()
+
+        assert isinstance(first, VPNGateHandler)
+        assert first is second
+        mock_parse.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_vpngate_handler_refreshes_stale_list(sample_csv):
+    """
+    Once the handler's server list is older than its TTL, the next request
+    starts a background refetch of the CSV through the async parser and is
+    served the stale list meanwhile.
+    """
+    with patch(
+        "core.services.parser.Parser.parse_url_lines",
+        return_value=sample_csv.splitlines(),
+    ) as mock_parse:
+        handler = await get_vpngate_handler()
+        handler.get_vpn_servers()
+
+        timestamp, servers = handler._raw_cache
+        handler._raw_cache = (timestamp - handler.SERVERS_CACHE_TTL, servers)
+
+        assert await get_vpngate_handler() is handler
+        assert handler._raw_cache[1] is servers
+
+        await vpn_handler_fabric._refresh_task
+        assert mock_parse.await_count == 2
+        assert len(handler.get_vpn_servers()) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_vpngate_handler_does_not_wait_for_slow_refresh(sample_csv):
+    """
+    While a slow refetch of a stale list is in flight, other requests are
+    answered right away from the stale list and no second fetch is started.
+    """
+    release = asyncio.Event()
+
+    async def slow_parse(self):
+        if mock_parse.await_count > 1:
+            await release.wait()
+        return sample_csv.splitlines()
+
+    with patch(
+        "core.services.parser.Parser.parse_url_lines",
+        autospec=True,
+        side_effect=slow_parse,
+    ) as mock_parse:
+        handler = await get_vpngate_handler()
+        handler.get_vpn_servers()
+
+        timestamp, servers = handler._raw_cache
+        handler._raw_cache = (timestamp - handler.SERVERS_CACHE_TTL, servers)
+
+        for _ in range(3):
+            await asyncio.wait_for(get_vpngate_handler(), timeout=1)
+            assert len(handler.get_vpn_servers()) == 4
+        assert mock_parse.await_count == 2
+
+        release.set()
+        await vpn_handler_fabric._refresh_task
+        assert handler._raw_cache is None
+
+
+@pytest.mark.asyncio
+async def test_get_vpngate_handler_error_is_not_cached(sample_csv):
+    """
+    If building the handler fails, None is returned and the next call retries.
+    """
+    with patch(
+        "core.services.parser.Parser.parse_url_lines",
+        side_effect=[Exception("boom"), sample_csv.splitlines()],
+    ):
+        assert await get_vpngate_handler() is None
+        assert isinstance(await get_vpngate_handler(), VPNGateHandler)
+
+
+@pytest.mark.asyncio
+async def test_get_vpngate_handler_upstream_error_is_502():
+    """
+    If vpngate.net answers with an HTTP error, listing the servers raises a 502
+    instead of returning an empty list, and nothing is cached.
+    """
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                503, text="<html>\n<body>Service Unavailable</body>\n</html>\n"
+            )
+        )
+    )
+
+    with patch("core.services.parser._get_async_client", return_value=client):
+        handler = await get_vpngate_handler()
+
+        with pytest.raises(HTTPException) as exc_info:
+            handler.get_vpn_servers()
+        assert exc_info.value.status_code == 502
+        assert handler._raw_cache is None
+
+    await client.aclose()
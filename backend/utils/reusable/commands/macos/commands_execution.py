@@ -2,16 +2,28 @@
 
 import asyncio
 import logging
+import shutil
+from functools import lru_cache
+from typing import Sequence
 
 logger = logging.getLogger(__name__)
 
 
-async def run_macos_command(cmd: list, timeout: float = None) -> (str, str):
+@lru_cache(maxsize=None)
+def _resolve_executable(name: str) -> str:
+    """
+    Returns the absolute path of a command, looked up on PATH once per name.
+    Falls back to the name itself, so a missing command still fails at exec time.
+    """
+    return shutil.which(name) or name
+
+
+async def run_macos_command(cmd: Sequence[str], timeout: float = None) -> (str, str):
     """
     Executes a macOS command asynchronously and returns the decoded stdout and stderr.
 
     Args:
-        cmd (list): List of command arguments (e.g. ["scutil", "--nc", "start", "MyL2TP"]).
+        cmd (Sequence[str]): Command arguments (e.g. ["scutil", "--nc", "start", "MyL2TP"]).
         timeout (float, optional): Timeout in seconds.
 
     Returns:
@@ -21,10 +33,15 @@ async def run_macos_command(cmd: list, timeout: float = None) -> (str, str):
         RuntimeError: If the command exits with a nonzero return code or times out.
     """
     try:
+        # An absolute path and close_fds=False keep subprocess on its posix_spawn
+        # path on macOS instead of fork+exec. Python's own descriptors are created
+        # non-inheritable, so the child still doesn't get them.
         process = await asyncio.create_subprocess_exec(
-            *cmd,
+            _resolve_executable(cmd[0]),
+            *cmd[1:],
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            close_fds=False,
         )
         stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
         stdout_str = stdout.decode().strip()
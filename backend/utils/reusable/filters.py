@@ -26,4 +26,4 @@ filters_VPN_GATE = [
     # "OpenVPN_ConfigData_Base64\r",
 ]
 
-filters_VPN_GATE_set = set(filters_VPN_GATE)
+filters_VPN_GATE_set = frozenset(filters_VPN_GATE)
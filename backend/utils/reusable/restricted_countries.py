@@ -5,3 +5,6 @@ class RestrictedCountries(Enum):
     RUSSIA = "RU"
     IRAN = "IR"
     CHINA = "CN"
+
+
+restricted_countries_set = frozenset(country.value for country in RestrictedCountries)